@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agri.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Long-lived dashboard alert streams are served outside Django's request cycle
+from agriapp.live_alerts import LiveAlertsApp  # noqa: E402
+
+application = LiveAlertsApp(django_application)
@@ -45,10 +45,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'agriapp.middleware.UserLocationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -83,6 +85,52 @@ DATABASES = {
     }
 }
 
+# SQLite production mode (SQLITE_PRODUCTION_MODE=1):
+# - WAL journaling + busy timeout applied on every new connection
+# - persistent connections
+# - sessions and cache moved into their own SQLite files
+# After enabling, run:
+#   python manage.py migrate
+#   python manage.py migrate --database=sessions
+#   python manage.py createcachetable --database=cache
+SQLITE_PRODUCTION_MODE = os.getenv("SQLITE_PRODUCTION_MODE") == "1"
+
+# Run on every new SQLite connection by agriapp.db_routers.apply_sqlite_pragmas
+# (Django 4.2 has no 'init_command' OPTION for SQLite)
+SQLITE_PRAGMAS = []
+
+if SQLITE_PRODUCTION_MODE:
+    SQLITE_OPTIONS = {
+        'timeout': 20,
+    }
+    SQLITE_PRAGMAS = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA busy_timeout=20000',
+        'PRAGMA temp_store=MEMORY',
+    ]
+    DATABASES = {
+        alias: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / filename,
+            'OPTIONS': SQLITE_OPTIONS,
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+        }
+        for alias, filename in [
+            ('default', 'db.sqlite3'),
+            ('sessions', 'sessions.sqlite3'),
+            ('cache', 'cache.sqlite3'),
+        ]
+    }
+    DATABASE_ROUTERS = ['agriapp.db_routers.SessionCacheRouter']
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'agri_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -123,6 +171,76 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
     
 ]
+# Built by `python manage.py collectstatic`: every file gets a content-hashed
+# name plus .gz and .br copies, and WhiteNoise serves the hashed names with
+# far-future immutable cache headers
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 LOGIN_URL = '/login/'
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-MANDI_API_KEY = os.getenv("MANDI_API_KEY")
\ No newline at end of file
+MANDI_API_KEY = os.getenv("MANDI_API_KEY")
+
+# Mandi searches are served from the local MandiPrice table while its
+# rows for the searched state are newer than this
+MANDI_LOCAL_MAX_AGE_HOURS = 24
+
+# Crop knowledge registry (one record per crop plus English / Hindi /
+# transliterated aliases); edit the JSON to add crops
+CROP_REGISTRY_FILE = BASE_DIR / "agriapp" / "data" / "crops.json"
+
+# Current weather readings are cached per city for this long
+WEATHER_CACHE_SECONDS = 10 * 60
+
+# 5-day forecasts are cached per coordinate for this long
+FORECAST_CACHE_SECONDS = 30 * 60
+
+# OpenWeather free tier: calls per day shared by all workers, and the most
+# that may be spent in one burst (the bucket refills at budget / 24h)
+OPENWEATHER_DAILY_BUDGET = int(os.getenv("OPENWEATHER_DAILY_BUDGET", "1000"))
+OPENWEATHER_BURST = 100
+
+# Last good weather / forecast is kept this long to serve when the quota
+# governor refuses a call or the upstream fails
+WEATHER_STALE_SECONDS = 24 * 60 * 60
+
+# Sliding-window limits for the JSON APIs: (requests, window seconds) per
+# logged-in user and per client IP, counted in RATE_LIMIT_DB by all workers
+RATE_LIMITS = {
+    # weather_api counts every requested city (a 40-city dashboard poll is 40)
+    'weather_api': {'user': (120, 60), 'ip': (480, 60)},
+    'crop_insight_api': {'user': (60, 60), 'ip': (240, 60)},
+    'planner_scenarios_api': {'user': (10, 60), 'ip': (40, 60)},
+}
+RATE_LIMIT_DB = BASE_DIR / "ratelimit.sqlite3"
+
+# Cities upstream answered 404 for are not asked again for this long
+WEATHER_NOT_FOUND_SECONDS = 60 * 60
+
+# Raw weather readings are kept this long; `manage.py rollup_weather` keeps
+# daily / monthly rollups forever for climatology
+WEATHER_RAW_RETENTION_DAYS = 30
+
+# Bundled city / district coordinates; places not listed here are learnt
+# from upstream weather responses (PlaceCoordinate)
+PLACES_FILE = BASE_DIR / "agriapp" / "data" / "places.json"
+
+# Coastal / inland / arid zones of India on a 0.1° grid; the .npy is built
+# from the JSON by `manage.py build_climate_raster`
+CLIMATE_ZONES_FILE = BASE_DIR / "agriapp" / "data" / "climate_zones.json"
+CLIMATE_RASTER_FILE = BASE_DIR / "agriapp" / "data" / "climate_zones.npy"
+
+# Cities (most farmers first) whose weather each gunicorn worker fetches
+# during warm-up; 0 disables weather priming
+WARMUP_WEATHER_CITIES = int(os.getenv("WARMUP_WEATHER_CITIES", "0"))
+
+# Live dashboard alerts (server-sent events): how often each city's cached
+# weather is checked for changes, and the idle keep-alive interval
+LIVE_ALERTS_POLL_SECONDS = 60
+LIVE_ALERTS_KEEPALIVE_SECONDS = 25
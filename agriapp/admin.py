@@ -1,4 +1,39 @@
 from django.contrib import admin
-from .models import Crop
-admin.site.register(Crop)
-# Register your models here.
+from .models import Crop, UserProfile, MandiPrice, PlaceCoordinate, WeatherRollup
+
+
+@admin.register(Crop)
+class CropAdmin(admin.ModelAdmin):
+    list_display = ('name', 'season', 'area', 'user', 'created_at')
+    list_filter = ('season',)
+    search_fields = ('name', 'user__username')
+    list_select_related = ('user',)
+
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'state', 'city', 'created_at')
+    list_filter = ('state',)
+    search_fields = ('user__username', 'city')
+    list_select_related = ('user',)
+
+
+@admin.register(MandiPrice)
+class MandiPriceAdmin(admin.ModelAdmin):
+    list_display = ('commodity', 'market', 'district', 'state', 'arrival_date', 'modal_price')
+    list_filter = ('state', 'commodity')
+    search_fields = ('market', 'district')
+    date_hierarchy = 'arrival_date'
+
+
+@admin.register(PlaceCoordinate)
+class PlaceCoordinateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'lat', 'lon', 'updated_at')
+    search_fields = ('name',)
+
+
+@admin.register(WeatherRollup)
+class WeatherRollupAdmin(admin.ModelAdmin):
+    list_display = ('city', 'period', 'period_start', 'source', 'temp_mean', 'humidity_mean', 'rain_fraction')
+    list_filter = ('period', 'source')
+    search_fields = ('city',)
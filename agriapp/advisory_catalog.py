@@ -0,0 +1,340 @@
+"""
+Advisory Message Catalog
+Advisories carry only an advisory_key, display fields (alert_type, icon, ...)
+and format parameters; alert_type / icon default to the catalog entry. Text comes from this catalog, formatted on first
+access and only in the language that is actually read:
+    advisory['message_en']           -> formatted English message
+    localize(advisories, 'hi')       -> plain dicts with Hindi text only (for JSON)
+State risk texts are taken from state_risks.RISK_ADVISORIES.
+"""
+
+from functools import lru_cache
+
+
+LANGUAGES = ('en', 'hi')
+DEFAULT_LANGUAGE = 'en'
+
+# Read priority actions as action_en / action_hi
+FIELD_ALIASES = {'action': 'suggested_action'}
+
+# Display fields fixed per advisory key; callers may still override them
+STYLE_FIELDS = ('alert_type', 'icon')
+
+
+CROP_MESSAGES = {
+    # ---------- crops with known rules ----------
+    'EXTENDED_HEAT_STRESS': {
+        'alert_type': 'danger', 'icon': '🔥',
+        'en': {
+            'message': '⚠️ Extended heat period ({days} days) will stress {crop}',
+            'suggested_action': 'Plan increased irrigation for next {days} days. Consider mulching to retain moisture.',
+        },
+        'hi': {
+            'message': '⚠️ लंबी गर्मी की अवधि ({days} दिन) {crop_hi} को तनाव देगी',
+            'suggested_action': 'अगले {days} दिनों के लिए बढ़ी हुई सिंचाई की योजना बनाएं। नमी बनाए रखने के लिए मल्चिंग पर विचार करें।',
+        },
+    },
+    'HEAT_STRESS_CRITICAL': {
+        'alert_type': 'danger', 'icon': '🔥',
+        'en': {
+            'message': '⚠️ Critical heat stress for {crop}',
+            'suggested_action': 'Irrigate early morning (before 7 AM). Provide shade if possible.',
+        },
+        'hi': {
+            'message': '⚠️ {crop_hi} के लिए गंभीर गर्मी का तनाव',
+            'suggested_action': 'सुबह जल्दी (7 बजे से पहले) सिंचाई करें। संभव हो तो छाया दें।',
+        },
+    },
+    'HEAT_STRESS_MODERATE': {
+        'alert_type': 'warning', 'icon': '🌡️',
+        'en': {
+            'message': 'High temperature may stress {crop}',
+            'suggested_action': 'Avoid irrigation during afternoon. Water in evening or early morning.',
+        },
+        'hi': {
+            'message': 'अधिक तापमान {crop_hi} को नुकसान पहुँचा सकता है',
+            'suggested_action': 'दोपहर में सिंचाई न करें। शाम या सुबह पानी दें।',
+        },
+    },
+    'COLD_STRESS': {
+        'alert_type': 'info', 'icon': '❄️',
+        'en': {
+            'message': 'Temperature below ideal for {crop}',
+            'suggested_action': 'Growth may slow down. No immediate action needed.',
+        },
+        'hi': {
+            'message': '{crop_hi} के लिए तापमान कम है',
+            'suggested_action': 'विकास धीमा हो सकता है। तुरंत कोई कार्रवाई जरूरी नहीं।',
+        },
+    },
+    'TEMP_FAVORABLE': {
+        'alert_type': 'success', 'icon': '✅',
+        'en': {
+            'message': 'Favorable temperature for {crop}',
+            'suggested_action': 'Continue normal farming practices.',
+        },
+        'hi': {
+            'message': '{crop_hi} के लिए अनुकूल तापमान',
+            'suggested_action': 'सामान्य खेती जारी रखें।',
+        },
+    },
+    'TEMP_ABOVE_NORMAL': {
+        'alert_type': 'warning', 'icon': '🌡️',
+        'en': {
+            'message': '{delta}°C warmer than normal for this week ({normal}°C) - {crop} will use more water',
+            'suggested_action': 'Check soil moisture more often than usual and irrigate before it dries out.',
+        },
+        'hi': {
+            'message': 'इस सप्ताह सामान्य ({normal}°C) से {delta}°C अधिक गर्मी - {crop_hi} को अधिक पानी चाहिए',
+            'suggested_action': 'मिट्टी की नमी सामान्य से अधिक बार जांचें और सूखने से पहले सिंचाई करें।',
+        },
+    },
+    'TEMP_BELOW_NORMAL': {
+        'alert_type': 'info', 'icon': '❄️',
+        'en': {
+            'message': '{delta}°C cooler than normal for this week ({normal}°C) - {crop} will grow slower',
+            'suggested_action': 'Crops use less water in cool spells; irrigate only when the soil is dry.',
+        },
+        'hi': {
+            'message': 'इस सप्ताह सामान्य ({normal}°C) से {delta}°C ठंडा - {crop_hi} की बढ़त धीमी होगी',
+            'suggested_action': 'ठंड में फसल कम पानी लेती है; मिट्टी सूखी हो तभी सिंचाई करें।',
+        },
+    },
+    'WEATHER_UNPREDICTABLE': {
+        'alert_type': 'warning', 'icon': '⚠️',
+        'en': {
+            'message': 'Unstable weather pattern this week - risky for {crop}',
+            'suggested_action': 'Delay major farming decisions (spraying, fertilizing). Monitor daily weather.',
+        },
+        'hi': {
+            'message': 'इस सप्ताह अस्थिर मौसम पैटर्न - {crop_hi} के लिए जोखिम भरा',
+            'suggested_action': 'प्रमुख खेती के निर्णयों (छिड़काव, उर्वरक) में देरी करें। दैनिक मौसम की निगरानी करें।',
+        },
+    },
+    'RAIN_DETECTED': {
+        'alert_type': 'info', 'icon': '🌧️',
+        'en': {
+            'message': 'Rain expected or ongoing',
+            'suggested_action': 'Skip irrigation today. Save water and costs.',
+        },
+        'hi': {
+            'message': 'बारिश होने वाली है या हो रही है',
+            'suggested_action': 'आज सिंचाई छोड़ दें। पानी और खर्च बचाएं।',
+        },
+    },
+    'IRRIGATION_HIGH_NEED': {
+        'alert_type': 'warning', 'icon': '💧',
+        'en': {
+            'message': '{crop} needs regular watering',
+            'suggested_action': 'Irrigate daily. Check soil moisture regularly.',
+        },
+        'hi': {
+            'message': '{crop_hi} को नियमित पानी चाहिए',
+            'suggested_action': 'रोज़ाना सिंचाई करें। मिट्टी की नमी जांचें।',
+        },
+    },
+    'IRRIGATION_MEDIUM_NEED': {
+        'alert_type': 'info', 'icon': '💧',
+        'en': {
+            'message': 'Moderate irrigation required',
+            'suggested_action': 'Irrigate every 2-3 days based on soil condition.',
+        },
+        'hi': {
+            'message': 'मध्यम सिंचाई आवश्यक है',
+            'suggested_action': 'मिट्टी की स्थिति के अनुसार 2-3 दिन में सिंचाई करें।',
+        },
+    },
+    'IRRIGATION_LOW_NEED': {
+        'alert_type': 'info', 'icon': '💧',
+        'en': {
+            'message': '{crop} is drought-tolerant but needs care in heat',
+            'suggested_action': 'Light irrigation every 4-5 days is sufficient.',
+        },
+        'hi': {
+            'message': '{crop_hi} सूखा सहनशील है पर गर्मी में देखभाल चाहिए',
+            'suggested_action': 'हर 4-5 दिन में हल्की सिंचाई काफी है।',
+        },
+    },
+    'FUNGAL_RISK': {
+        'alert_type': 'warning', 'icon': '🍄',
+        'en': {
+            'message': 'High humidity increases fungal disease risk',
+            'suggested_action': 'Monitor for leaf spots. Ensure good air circulation.',
+        },
+        'hi': {
+            'message': 'अधिक नमी से फफूंद रोग का खतरा बढ़ता है',
+            'suggested_action': 'पत्तियों पर धब्बे देखें। हवा का संचार अच्छा रखें।',
+        },
+    },
+
+    # ---------- fallback for unknown crops ----------
+    'GENERIC_HEAT': {
+        'alert_type': 'warning', 'icon': '🔥',
+        'en': {
+            'message': 'High heat may affect {crop}',
+            'suggested_action': 'Increase watering frequency. Avoid midday activities.',
+        },
+        'hi': {
+            'message': 'अधिक गर्मी {crop} को प्रभावित कर सकती है',
+            'suggested_action': 'पानी देने की आवृत्ति बढ़ाएं। दोपहर में काम न करें।',
+        },
+    },
+    'GENERIC_COLD': {
+        'alert_type': 'info', 'icon': '❄️',
+        'en': {
+            'message': 'Cool weather for {crop}',
+            'suggested_action': 'Monitor growth. Protect from frost if needed.',
+        },
+        'hi': {
+            'message': '{crop} के लिए ठंडा मौसम',
+            'suggested_action': 'विकास पर नजर रखें। जरूरत हो तो पाले से बचाएं।',
+        },
+    },
+    'GENERIC_NORMAL': {
+        'alert_type': 'success', 'icon': '✅',
+        'en': {
+            'message': 'Weather conditions suitable for {crop}',
+            'suggested_action': 'Continue regular farm operations.',
+        },
+        'hi': {
+            'message': '{crop} के लिए मौसम उपयुक्त है',
+            'suggested_action': 'नियमित खेती जारी रखें।',
+        },
+    },
+    'GENERIC_RAIN': {
+        'alert_type': 'info', 'icon': '🌧️',
+        'en': {
+            'message': 'Rain expected',
+            'suggested_action': 'Skip irrigation. Prepare drainage if heavy rain.',
+        },
+        'hi': {
+            'message': 'बारिश की संभावना',
+            'suggested_action': 'सिंचाई छोड़ें। भारी बारिश हो तो जल निकासी तैयार रखें।',
+        },
+    },
+}
+
+
+FARM_SUMMARY_MESSAGES = {
+    'FARM_NORMAL': {
+        'en': {'primary_action': 'Continue regular farm operations', 'weather_tip': 'Weather conditions are stable today.'},
+        'hi': {'primary_action': 'नियमित खेती जारी रखें', 'weather_tip': 'मौसम की स्थिति आज स्थिर है।'},
+    },
+    'FARM_IRRIGATE': {
+        'en': {'primary_action': 'Focus on irrigation today',
+               'weather_tip': 'High temperature ({temp}°C) - water crops early morning (before 7 AM).'},
+        'hi': {'primary_action': 'आज सिंचाई पर ध्यान दें',
+               'weather_tip': 'उच्च तापमान ({temp}°C) - सुबह जल्दी (7 बजे से पहले) फसलों को पानी दें।'},
+    },
+    'FARM_MONITOR': {
+        'en': {'primary_action': 'Monitor crops for disease',
+               'weather_tip': 'High humidity ({humidity}%) increases fungal disease risk.'},
+        'hi': {'primary_action': 'फसलों में बीमारी की निगरानी करें',
+               'weather_tip': 'अधिक नमी ({humidity}%) से फफूंद रोग का खतरा बढ़ता है।'},
+    },
+    'FARM_RAIN': {
+        'en': {'primary_action': 'Prepare for rain', 'weather_tip': 'Rain expected - skip irrigation and ensure drainage.'},
+        'hi': {'primary_action': 'बारिश के लिए तैयार रहें', 'weather_tip': 'बारिश की संभावना - सिंचाई छोड़ें।'},
+    },
+    'FARM_COLD': {
+        'en': {'primary_action': 'Protect from cold', 'weather_tip': 'Low temperature ({temp}°C) - protect from frost.'},
+        'hi': {'primary_action': 'ठंड से बचाएं', 'weather_tip': 'कम तापमान ({temp}°C) - पाले से बचाएं।'},
+    },
+    'FARM_URGENT_ACTION': {
+        'en': {'primary_action': 'Urgent action required', 'weather_tip': '{stressed} crop(s) under stress.'},
+        'hi': {'primary_action': 'तत्काल कार्रवाई आवश्यक', 'weather_tip': '{stressed} फसल(ें) तनाव में हैं।'},
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def catalog_source():
+    """
+    advisory_key -> {'alert_type', 'icon', 'en': {field: text}, 'hi': {...}}
+    State risk texts are folded in here to avoid a circular import
+    """
+    from .state_risks import RISK_ADVISORIES
+
+    catalog = dict(CROP_MESSAGES)
+    catalog.update(FARM_SUMMARY_MESSAGES)
+    for risk_type, info in RISK_ADVISORIES.items():
+        entry = {'alert_type': info['severity'], 'icon': info['icon']}
+        for lang in LANGUAGES:
+            entry[lang] = {
+                'name': info[f'name_{lang}'],
+                'message': info[f'message_{lang}'],
+                'suggested_action': info[f'action_{lang}'],
+                'farm_impact': info[f'farm_impact_{lang}'],
+            }
+        catalog[risk_type.upper()] = entry
+    return catalog
+
+
+@lru_cache(maxsize=None)
+def compiled_catalog():
+    """advisory_key -> language -> field -> bound format_map, built once"""
+    return {
+        key: {lang: {field: text.format_map for field, text in entry[lang].items()} for lang in LANGUAGES}
+        for key, entry in catalog_source().items()
+    }
+
+
+def advisory_style(advisory_key):
+    """Catalog alert_type / icon for a key ({} for summary keys without one)"""
+    entry = catalog_source().get(advisory_key, {})
+    return {field: entry[field] for field in STYLE_FIELDS if field in entry}
+
+
+def format_message(advisory_key, field, lang, params):
+    field = FIELD_ALIASES.get(field, field)
+    try:
+        return compiled_catalog()[advisory_key][lang][field](params)
+    except KeyError:
+        # Unknown key / field, or a parameter missing from an old payload
+        return ''
+
+
+class Advisory(dict):
+    """
+    Dict of display fields; '<field>_<lang>' text keys are formatted from the
+    catalog the first time they are read (so templates and existing callers
+    keep using advisory['message_en'])
+    """
+
+    def __init__(self, advisory_key, params=None, **fields):
+        super().__init__(advisory_style(advisory_key), advisory_key=advisory_key, params=params or {}, **fields)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild from JSON (e.g. a stored DailyAdvisory row)"""
+        data = dict(data)
+        return cls(data.pop('advisory_key', ''), data.pop('params', None), **data)
+
+    def __missing__(self, name):
+        field, _, lang = name.rpartition('_')
+        if lang not in LANGUAGES or not field:
+            raise KeyError(name)
+        text = format_message(self['advisory_key'], field, lang, self['params'])
+        self[name] = text
+        return text
+
+    def text(self, field, lang):
+        return self[f'{field}_{lang}']
+
+    def localized(self, lang, fields=('message', 'suggested_action')):
+        """Plain dict with text in one language, for JSON responses"""
+        data = {key: value for key, value in self.items()
+                if key != 'params' and key.rpartition('_')[2] not in LANGUAGES}
+        for field in fields:
+            data[field] = self.text(field, lang)
+        return data
+
+
+def localize(advisories, lang, fields=('message', 'suggested_action')):
+    return [Advisory.from_dict(advisory).localized(lang, fields) for advisory in advisories]
+
+
+def get_language(request):
+    """?lang=en|hi, defaulting to English"""
+    lang = (request.GET.get('lang') or '').lower()
+    return lang if lang in LANGUAGES else DEFAULT_LANGUAGE
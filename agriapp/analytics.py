@@ -0,0 +1,98 @@
+"""
+Regional Crop Analytics
+Acreage and projected water demand per crop, season and state, computed by a
+single GROUP BY over Crop joined with UserProfile. Each group's water factor
+comes from find_crop, the same name resolution the planner uses. Results are
+cached and the cache is invalidated whenever a crop is saved or deleted. With a shared cache
+(the database cache in SQLite production mode) that reaches every worker at
+once; with the default per-process cache the other workers may serve a
+summary up to ANALYTICS_CACHE_TIMEOUT (60 s) old.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Coalesce, Lower, Trim
+
+from .crop_registry import find_crop
+from .models import Crop
+
+
+# Litres per acre per irrigation, same factors as the farm planner
+WATER_FACTOR_BY_REQUIREMENT = {
+    'HIGH': 15000,
+    'MEDIUM': 12000,
+    'LOW': 8000,
+}
+DEFAULT_WATER_FACTOR = 12000
+
+# Also the staleness bound for workers that missed an invalidation
+ANALYTICS_CACHE_TIMEOUT = 60
+ANALYTICS_VERSION_KEY = 'regional_analytics:version'
+
+
+def water_factor(crop_name):
+    """Litres per acre for a crop name; unknown crops and crops without a requirement get the default"""
+    record = find_crop(crop_name)
+    if record is None or record.water_requirement is None:
+        return DEFAULT_WATER_FACTOR
+    return WATER_FACTOR_BY_REQUIREMENT[record.water_requirement]
+
+
+def compute_regional_summary(state=None, season=None):
+    """
+    One aggregate query: rows grouped by (crop, season, state)
+    """
+    queryset = Crop.objects.annotate(
+        crop_key=Lower(Trim('name')),
+        region=Coalesce('user__userprofile__state', Value('Unknown')),
+    )
+    if state:
+        queryset = queryset.filter(user__userprofile__state=state)
+    if season:
+        queryset = queryset.filter(season=season)
+
+    rows = list(
+        queryset.values('crop_key', 'season', 'region')
+        .annotate(
+            total_area=Sum(F('area'), output_field=FloatField()),
+            plots=Count('id'),
+            farmers=Count('user', distinct=True),
+        )
+        .order_by('region', '-total_area')
+    )
+
+    for row in rows:
+        # Every plot in a group has the same name, so one factor covers the group's area
+        row['water_demand'] = int((row['total_area'] or 0) * water_factor(row['crop_key']))
+        row['crop'] = row.pop('crop_key').title()
+        row['state'] = row.pop('region')
+        row['total_area'] = round(row['total_area'] or 0, 2)
+
+    return {
+        'filters': {'state': state, 'season': season},
+        'rows': rows,
+        'total_area': round(sum(row['total_area'] for row in rows), 2),
+        'total_water_demand': sum(row['water_demand'] for row in rows),
+        'total_plots': sum(row['plots'] for row in rows),
+    }
+
+
+def get_regional_summary(state=None, season=None):
+    """Cached compute_regional_summary; the key carries the invalidation version"""
+    version = cache.get_or_set(ANALYTICS_VERSION_KEY, time.time_ns, None)
+    key = f"regional_analytics:{version}:{state or ''}:{season or ''}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_regional_summary(state, season)
+        cache.set(key, summary, ANALYTICS_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_regional_summary():
+    try:
+        cache.incr(ANALYTICS_VERSION_KEY)
+    except ValueError:
+        # Version was evicted: start from a fresh value so old keys are never reused
+        cache.set(ANALYTICS_VERSION_KEY, time.time_ns(), None)
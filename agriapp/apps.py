@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AgriappConfig(AppConfig):
     name = 'agriapp'
+
+    def ready(self):
+        from . import checks  # noqa: F401  registers the static asset check
+        from . import db_routers  # noqa: F401  registers the SQLite PRAGMA receiver
@@ -0,0 +1,48 @@
+"""
+Static Asset Checks
+Every local asset a template loads must go through {% static %} and exist
+in the static dirs, otherwise the manifest storage cannot give it a hashed,
+cache-busted name. Runs with `python manage.py check` (and before collectstatic).
+"""
+
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Tags, register
+
+
+STATIC_TAG_RE = re.compile(r"""{%\s*static\s+['"]([^'"]+)['"]\s*%}""")
+# src="/static/..." or href="static/..." written out by hand
+HARDCODED_ASSET_RE = re.compile(r"""(?:src|href)\s*=\s*['"]/?static/([^'"]+)['"]""")
+
+
+def _template_files():
+    for engine in settings.TEMPLATES:
+        for directory in engine.get('DIRS', []):
+            yield from sorted(Path(directory).rglob('*.html'))
+
+
+@register(Tags.staticfiles)
+def check_template_assets(app_configs, **kwargs):
+    errors = []
+    for path in _template_files():
+        text = path.read_text(encoding='utf-8')
+
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            for asset in HARDCODED_ASSET_RE.findall(line):
+                errors.append(Error(
+                    f"{path.name}:{line_no} references '{asset}' without {{% static %}}",
+                    hint="Use {% static '...' %} so the hashed filename is served",
+                    id='agriapp.E001',
+                ))
+
+            for asset in STATIC_TAG_RE.findall(line):
+                if not finders.find(asset):
+                    errors.append(Error(
+                        f"{path.name}:{line_no} references missing static file '{asset}'",
+                        hint="Files missing from STATICFILES_DIRS get no hashed name in the manifest",
+                        id='agriapp.E002',
+                    ))
+    return errors
@@ -0,0 +1,92 @@
+"""
+Climate Zone Raster
+Coarse lat/lon grid of India (settings.CLIMATE_RASTER_FILE, uint8 codes
+indexing "zones" in settings.CLIMATE_ZONES_FILE), memory-mapped so every
+worker shares the same pages. A lookup is two subtractions and an index:
+    climate_zone(26.9, 75.8)              -> 'arid'
+    climate_zones([13.08, 28.6], [80.27, 77.2]) -> ['coastal', 'inland']
+Places outside the grid fall back to DEFAULT_ZONE.
+Rebuild the .npy with `manage.py build_climate_raster` after editing the JSON.
+"""
+
+import json
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .geocoding import get_coordinates
+
+
+DEFAULT_ZONE = 'inland'
+
+
+def grid_shape(grid):
+    """(rows, cols) of the raster described by the JSON "grid" block"""
+    return (
+        int(round((grid['lat_max'] - grid['lat_min']) / grid['step'])),
+        int(round((grid['lon_max'] - grid['lon_min']) / grid['step'])),
+    )
+
+
+def load_zone_source(path=None):
+    with open(path or settings.CLIMATE_ZONES_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def climate_raster():
+    """(grid, zone names, memory-mapped uint8 array), opened once per process"""
+    source = load_zone_source()
+    grid = source['grid']
+    raster = np.load(settings.CLIMATE_RASTER_FILE, mmap_mode='r')
+    if raster.shape != grid_shape(grid) or raster.dtype != np.uint8:
+        raise ImproperlyConfigured(
+            f"{settings.CLIMATE_RASTER_FILE} does not match {settings.CLIMATE_ZONES_FILE}; "
+            "run `manage.py build_climate_raster`"
+        )
+    # Code 0 ("none") is a cell no rule covers; report it as the default zone
+    names = np.array([DEFAULT_ZONE] + source['zones'][1:], dtype=object)
+    return grid, names, raster
+
+
+def zone_codes(lats, lons):
+    """Vectorized raster codes for coordinate arrays (0 outside the grid)"""
+    grid, _, raster = climate_raster()
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    rows = np.floor((lats - grid['lat_min']) / grid['step'])
+    cols = np.floor((lons - grid['lon_min']) / grid['step'])
+    inside = (rows >= 0) & (rows < raster.shape[0]) & (cols >= 0) & (cols < raster.shape[1])
+
+    codes = np.zeros(lats.shape, dtype=np.uint8)
+    codes[inside] = raster[rows[inside].astype(np.intp), cols[inside].astype(np.intp)]
+    return codes
+
+
+def climate_zones(lats, lons):
+    """Zone name for each (lat, lon) pair"""
+    _, names, _ = climate_raster()
+    return names[zone_codes(lats, lons)].tolist()
+
+
+def climate_zone(lat, lon):
+    """Zone name for one point; DEFAULT_ZONE when coordinates are missing"""
+    if lat is None or lon is None:
+        return DEFAULT_ZONE
+    grid, names, raster = climate_raster()
+    row = int((lat - grid['lat_min']) // grid['step'])
+    col = int((lon - grid['lon_min']) // grid['step'])
+    if 0 <= row < raster.shape[0] and 0 <= col < raster.shape[1]:
+        return names[raster[row, col]]
+    return DEFAULT_ZONE
+
+
+def climate_zone_for_place(place, weather_data=None):
+    """Zone of a city / district, using upstream coordinates when it is not known locally"""
+    coords = get_coordinates(place)
+    if coords is None and weather_data:
+        coords = (weather_data.get('lat'), weather_data.get('lon'))
+    return climate_zone(*coords) if coords else DEFAULT_ZONE
@@ -0,0 +1,115 @@
+"""
+Crop Knowledge Registry
+One immutable record per crop, loaded from settings.CROP_REGISTRY_FILE
+(agriapp/data/crops.json), so agronomists can add crops or aliases without
+code changes. Every English, Hindi and transliterated name is indexed, so
+"Paddy", "dhan" and "धान" all resolve to the same Rice record in O(1).
+Only whole names match: compound names ("Basmati Rice") need their own alias,
+so "Sweet Potato" never lands on Potato.
+"""
+
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+WATER_REQUIREMENTS = {'HIGH', 'MEDIUM', 'LOW'}
+
+# Optional numeric fields; a crop without an ideal range has no advisory profile
+RULE_FIELDS = ['ideal_temp_min', 'ideal_temp_max', 'heat_stress_threshold', 'cold_stress_threshold']
+
+SEPARATORS_RE = re.compile(r"[\s\-_.,/()]+")
+
+
+def normalize_crop_name(name):
+    """Case-, spacing- and punctuation-insensitive key ("Arhar (Tur)" -> "arhar tur")"""
+    name = unicodedata.normalize('NFC', str(name))
+    return SEPARATORS_RE.sub(' ', name).strip().casefold()
+
+
+@dataclass(frozen=True, slots=True)
+class CropRecord:
+    name: str
+    name_hi: str
+    season: str
+    aliases: tuple
+    water_requirement: str = None
+    ideal_temp_min: float = None
+    ideal_temp_max: float = None
+    heat_stress_threshold: float = None
+    cold_stress_threshold: float = None
+    rules: MappingProxyType = None
+
+    @property
+    def has_advisory_profile(self):
+        return self.ideal_temp_min is not None and self.ideal_temp_max is not None
+
+
+def _build_record(entry):
+    name = str(entry.get('name') or '').strip()
+    season = str(entry.get('season') or '').strip()
+    if not name or not season:
+        raise ImproperlyConfigured(f"Crop registry entry needs a name and a season: {entry}")
+
+    water = entry.get('water_requirement')
+    if water is not None and water not in WATER_REQUIREMENTS:
+        raise ImproperlyConfigured(f"{name}: water_requirement must be one of {sorted(WATER_REQUIREMENTS)}")
+
+    values = {field: entry.get(field) for field in RULE_FIELDS}
+    name_hi = entry.get('name_hi') or name
+
+    # Same keys the advisory code has always read from the knowledge base dict
+    rules = {'season': season, 'crop_name_hi': name_hi}
+    if water is not None:
+        rules['water_requirement'] = water
+    rules.update({field: value for field, value in values.items() if value is not None})
+
+    return CropRecord(
+        name=name,
+        name_hi=name_hi,
+        season=season,
+        aliases=tuple(entry.get('aliases') or ()),
+        water_requirement=water,
+        rules=MappingProxyType(rules),
+        **values,
+    )
+
+
+class CropRegistry:
+    def __init__(self, entries):
+        self.records = tuple(_build_record(entry) for entry in entries)
+        self.index = {}
+        for record in self.records:
+            for alias in (record.name, record.name_hi) + record.aliases:
+                key = normalize_crop_name(alias)
+                owner = self.index.setdefault(key, record)
+                if owner is not record:
+                    raise ImproperlyConfigured(f"Crop alias '{alias}' is used by both {owner.name} and {record.name}")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def find(self, name):
+        """Record for a known name or alias (whole normalized name only)"""
+        return self.index.get(normalize_crop_name(name))
+
+
+@lru_cache(maxsize=None)
+def get_registry():
+    return CropRegistry.from_file(settings.CROP_REGISTRY_FILE)
+
+
+@lru_cache(maxsize=4096)
+def find_crop(name):
+    """Memoized registry lookup; None for unknown crops"""
+    if not name:
+        return None
+    return get_registry().find(name)
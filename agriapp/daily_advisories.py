@@ -0,0 +1,76 @@
+"""
+Materialized Daily Advisories
+Fingerprints the inputs of crop insights so that precomputed rows
+can be reused until the city weather or the user's crops change
+"""
+
+import hashlib
+
+from .advisory_catalog import Advisory
+from .models import DailyAdvisory
+from .weather_archive import anomaly_level
+
+
+def weather_bucket(weather_data, forecast_analysis=None, anomaly=None):
+    """
+    Build a key from exactly the weather inputs the advisory rules read
+    Two readings with the same bucket always produce the same insights
+    """
+    description = weather_data.get('description', 'clear sky').lower()
+
+    if 'drizzle' in description:
+        sky = 'drizzle'
+    elif 'rain' in description:
+        sky = 'rain'
+    else:
+        sky = 'dry'
+
+    hot_streak = 0
+    unstable = 0
+    if forecast_analysis:
+        if forecast_analysis.get('max_consecutive_hot', 0) >= 3:
+            hot_streak = forecast_analysis['max_consecutive_hot']
+        if forecast_analysis.get('stability_score') == 'HIGHLY UNSTABLE':
+            unstable = 1
+
+    return (f"{weather_data.get('temp', 25)}|{weather_data.get('humidity', 65)}|{sky}|{hot_streak}|{unstable}"
+            f"|{anomaly_level(anomaly) or ''}")
+
+
+def crop_fingerprint(crops):
+    """
+    Hash of the crop set (id, name, area) owned by a user
+    """
+    parts = sorted(f"{crop.id}:{crop.name}:{crop.area}" for crop in crops)
+    return hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def serialize_crop_insights(all_crop_insights):
+    """Convert [{'crop': Crop, 'insights': [...]}] into {crop_id: [...]}"""
+    return {str(item['crop'].id): item['insights'] for item in all_crop_insights}
+
+
+def load_daily_advisory(user, city, crops, bucket):
+    """
+    Return (all_crop_insights, daily_insights) from the stored row
+    Returns None when the row is missing or was built from other inputs
+    """
+    row = DailyAdvisory.objects.filter(user=user).first()
+    if row is None:
+        return None
+
+    if row.city != city or row.weather_bucket != bucket:
+        return None
+
+    if row.crop_fingerprint != crop_fingerprint(crops):
+        return None
+
+    all_crop_insights = [
+        {'crop': crop, 'insights': [Advisory.from_dict(insight) for insight in row.crop_insights.get(str(crop.id), [])]}
+        for crop in crops
+    ]
+    daily_insights = {
+        'farm_summary': Advisory.from_dict(row.farm_summary),
+        'priority_actions': [Advisory.from_dict(action) for action in row.priority_actions],
+    }
+    return all_crop_insights, daily_insights
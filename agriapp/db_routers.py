@@ -0,0 +1,37 @@
+"""
+Database Router for SQLite production mode
+Sessions and the database cache live in their own SQLite files so their
+writes never wait on the crop/profile database's single writer lock.
+Every new SQLite connection also gets settings.SQLITE_PRAGMAS (WAL, busy timeout).
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and settings.SQLITE_PRAGMAS:
+        with connection.cursor() as cursor:
+            for pragma in settings.SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+
+
+class SessionCacheRouter:
+    route_app_labels = {
+        'sessions': 'sessions',
+        'django_cache': 'cache',
+    }
+
+    def db_for_read(self, model, **hints):
+        return self.route_app_labels.get(model._meta.app_label)
+
+    def db_for_write(self, model, **hints):
+        return self.route_app_labels.get(model._meta.app_label)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == self.route_app_labels.get(app_label, 'default')
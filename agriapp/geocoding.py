@@ -0,0 +1,80 @@
+"""
+Offline Geocoding
+Latitude / longitude for cities and districts without an upstream call, so
+the forecast can be requested alongside (not after) the current weather.
+Bundled places come from settings.PLACES_FILE; other places are learnt
+from current-weather responses and stored in PlaceCoordinate.
+"""
+
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .crop_registry import normalize_crop_name
+from .models import PlaceCoordinate
+
+
+# Misses are cached too, briefly, so unknown places do not query every request
+LEARNT_CACHE_SECONDS = 24 * 60 * 60
+MISS_CACHE_SECONDS = 10 * 60
+
+
+def normalize_place_name(name):
+    """"New-Delhi", " new delhi " -> "new delhi" (same rules as crop names)"""
+    return normalize_crop_name(name or '')
+
+
+def _cache_key(key):
+    return f"geo:{key.replace(' ', '_')}"
+
+
+@lru_cache(maxsize=None)
+def bundled_places():
+    """normalized name / alias -> (lat, lon)"""
+    with open(settings.PLACES_FILE, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    index = {}
+    for entry in entries:
+        coords = (entry['lat'], entry['lon'])
+        for name in [entry['name']] + entry.get('aliases', []):
+            index[normalize_place_name(name)] = coords
+    return index
+
+
+def get_coordinates(place):
+    """(lat, lon) for a known place, else None"""
+    key = normalize_place_name(place)
+    if not key:
+        return None
+
+    coords = bundled_places().get(key)
+    if coords is not None:
+        return coords
+
+    coords = cache.get(_cache_key(key))
+    if coords is None:
+        row = PlaceCoordinate.objects.filter(name=key).values_list('lat', 'lon').first()
+        coords = tuple(row) if row else ()
+        cache.set(_cache_key(key), coords, LEARNT_CACHE_SECONDS if row else MISS_CACHE_SECONDS)
+    return coords or None
+
+
+def learn_coordinates(place, lat, lon):
+    """Remember upstream coordinates for a place the bundled data lacks"""
+    key = normalize_place_name(place)
+    if not key or lat is None or lon is None or key in bundled_places():
+        return
+
+    coords = (round(lat, 4), round(lon, 4))
+    if cache.get(_cache_key(key)) == coords:
+        return
+
+    try:
+        PlaceCoordinate.objects.update_or_create(name=key, defaults={'lat': coords[0], 'lon': coords[1]})
+    except Exception as e:
+        print(f"Could not store coordinates for {place}: {e}")
+        return
+    cache.set(_cache_key(key), coords, LEARNT_CACHE_SECONDS)
@@ -0,0 +1,122 @@
+"""
+Irrigation Schedule Simulator
+Steps a simple FAO-56 style soil-water balance through the forecast window
+for every plot of a farm at once:
+    depletion += crop ET - effective rain
+    irrigate (refill to field capacity) once depletion passes the crop's
+    readily available water
+Reference ET is Hargreaves (temperature range + extraterrestrial radiation
+for the farm's latitude), so it needs only the daily forecast rows.
+Plots are arrays indexed [plot, day]; only the day loop is sequential.
+"""
+
+import math
+from datetime import date
+
+import numpy as np
+
+from .crop_registry import find_crop
+
+
+LITRES_PER_MM_ACRE = 4046.86  # 1 mm over one acre
+
+# Crop coefficient, rooting depth (m) and allowed depletion fraction per
+# water requirement class
+WATER_PROFILES = {
+    'HIGH': {'kc': 1.15, 'root_depth': 0.4, 'depletion': 0.2},
+    'MEDIUM': {'kc': 1.0, 'root_depth': 0.8, 'depletion': 0.5},
+    'LOW': {'kc': 0.75, 'root_depth': 1.2, 'depletion': 0.6},
+}
+
+SOIL_WATER_MM_PER_M = 140     # available water of a loam soil
+EFFECTIVE_RAIN_FRACTION = 0.8
+RAIN_DAY_MM = 8               # rain assumed on a rainy day without an amount
+DEFAULT_LATITUDE = 22.0       # central India, when the farm has no coordinates
+STARTING_DEPLETION = 0.5      # fraction of readily available water used at the start
+
+
+def crop_profile(crop_name):
+    record = find_crop(crop_name)
+    water = record.water_requirement if record and record.water_requirement else 'MEDIUM'
+    return WATER_PROFILES[water]
+
+
+def extraterrestrial_radiation_mm(latitude, day_of_year):
+    """FAO-56 eq. 21, as equivalent evaporation (mm/day); vectorized over days"""
+    phi = math.radians(latitude)
+    angle = 2 * np.pi * np.asarray(day_of_year, dtype=float) / 365
+    inverse_distance = 1 + 0.033 * np.cos(angle)
+    declination = 0.409 * np.sin(angle - 1.39)
+    sunset = np.arccos(np.clip(-math.tan(phi) * np.tan(declination), -1, 1))
+    ra_mj = (24 * 60 / np.pi) * 0.0820 * inverse_distance * (
+        sunset * math.sin(phi) * np.sin(declination) + math.cos(phi) * np.cos(declination) * np.sin(sunset)
+    )
+    return 0.408 * ra_mj
+
+
+def reference_et(forecast_days, latitude):
+    """Hargreaves reference evapotranspiration (mm/day) per forecast day"""
+    t_max = np.array([day['temp_max'] for day in forecast_days], dtype=float)
+    t_min = np.array([day['temp_min'] for day in forecast_days], dtype=float)
+    t_mean = np.array([day.get('temp_avg', (day['temp_max'] + day['temp_min']) / 2) for day in forecast_days],
+                      dtype=float)
+    day_of_year = [date.fromisoformat(day['date']).timetuple().tm_yday for day in forecast_days]
+    ra = extraterrestrial_radiation_mm(latitude, day_of_year)
+    return 0.0023 * (t_mean + 17.8) * np.sqrt(np.maximum(t_max - t_min, 0)) * ra
+
+
+def forecast_rain_mm(forecast_days):
+    return np.array([
+        day.get('rain_mm') or (RAIN_DAY_MM if day.get('rain_probability') else 0)
+        for day in forecast_days
+    ], dtype=float)
+
+
+def simulate_irrigation(plots, forecast_days, latitude=None, raining_now=False):
+    """
+    plots: [(crop_name, area_acres), ...]
+    Returns {'dates', 'et0_mm', 'rain_mm', 'plots': [{'irrigation_mm', 'litres', 'total_litres'}],
+    'total_litres'} or None without a forecast
+    """
+    if not forecast_days or not plots:
+        return None
+
+    profiles = [crop_profile(name) for name, _ in plots]
+    kc = np.array([profile['kc'] for profile in profiles])
+    total_water = np.array([profile['root_depth'] for profile in profiles]) * SOIL_WATER_MM_PER_M
+    readily_available = total_water * np.array([profile['depletion'] for profile in profiles])
+    areas = np.array([float(area) for _, area in plots])
+
+    et0 = reference_et(forecast_days, latitude if latitude is not None else DEFAULT_LATITUDE)
+    rain = forecast_rain_mm(forecast_days)
+
+    # [plot, day] demand and supply, computed in one shot
+    crop_et = kc[:, None] * et0[None, :]
+    effective_rain = np.broadcast_to(EFFECTIVE_RAIN_FRACTION * rain, crop_et.shape)
+
+    depletion = np.zeros(len(plots)) if raining_now else STARTING_DEPLETION * readily_available
+    irrigation = np.zeros(crop_et.shape)
+    for day in range(crop_et.shape[1]):
+        depletion = np.clip(depletion + crop_et[:, day] - effective_rain[:, day], 0, total_water)
+        due = depletion >= readily_available
+        irrigation[due, day] = depletion[due]
+        depletion[due] = 0
+
+    litres = irrigation * areas[:, None] * LITRES_PER_MM_ACRE
+    plot_totals = litres.sum(axis=1)
+
+    # Round whole matrices once; per-row numpy calls dominate for large farms
+    irrigation_rows = np.round(irrigation, 1).tolist()
+    litre_rows = np.rint(litres).astype(int).tolist()
+    total_rows = np.rint(plot_totals).astype(int).tolist()
+
+    return {
+        'dates': [day['date'] for day in forecast_days],
+        'et0_mm': np.round(et0, 1).tolist(),
+        'rain_mm': rain.tolist(),
+        'plots': [
+            {'irrigation_mm': mm, 'litres': row, 'total_litres': total}
+            for mm, row, total in zip(irrigation_rows, litre_rows, total_rows)
+        ],
+        'total_litres': int(round(plot_totals.sum())),
+    }
@@ -0,0 +1,266 @@
+"""
+Live Weather Alerts (server-sent events)
+Each process keeps one CityChannel per (city, state) that has connected
+dashboards. The channel polls the cached weather every LIVE_ALERTS_POLL_SECONDS
+and, only when the reading, forecast or state risks change, builds one snapshot
+that is fanned out to every subscriber in that city.
+
+Under ASGI, LiveAlertsApp (wired in agri/asgi.py) serves the stream outside
+Django's request cycle: an idle client is then just a coroutine waiting on a
+one-slot asyncio.Queue, so thousands fit in one process. Under WSGI the
+live_alerts view sends one event and lets the browser reconnect.
+"""
+
+import asyncio
+import json
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+
+from .advisory_catalog import LANGUAGES, DEFAULT_LANGUAGE, localize
+from .daily_advisories import weather_bucket
+from .state_risks import get_state_risk_advisories
+from .weather_forecast import get_7day_forecast, analyze_forecast_unpredictability, get_forecast_summary_en, get_forecast_summary_hi
+
+
+def build_snapshot(city, state, previous=None):
+    """
+    Shared alert data for one city, or None when nothing changed since `previous`
+    Runs in a worker thread (does network / cache I/O)
+    """
+    from .views import get_weather_data
+
+    weather_data = get_weather_data(city)
+    reading = (weather_data['temp'], weather_data['humidity'], weather_data['description'])
+    if previous and previous['reading'] == reading:
+        # Same cached reading: keep the forecast from the last snapshot
+        forecast_analysis = previous['forecast_analysis']
+    else:
+        forecast_analysis = None
+        if weather_data.get('lat') and weather_data.get('lon'):
+            daily_forecasts = get_7day_forecast(weather_data['lat'], weather_data['lon'])
+            if daily_forecasts:
+                forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
+
+    state_alerts = get_state_risk_advisories(state) if state else []
+    fingerprint = (
+        weather_bucket(weather_data, forecast_analysis),
+        tuple(forecast_analysis['warnings']) if forecast_analysis else (),
+        tuple(alert['advisory_key'] for alert in state_alerts),
+    )
+    if previous and previous['fingerprint'] == fingerprint:
+        return None
+
+    return {
+        'reading': reading,
+        'fingerprint': fingerprint,
+        'weather': weather_data,
+        'forecast_analysis': forecast_analysis,
+        'forecast_summary_en': get_forecast_summary_en(forecast_analysis) if forecast_analysis else None,
+        'forecast_summary_hi': get_forecast_summary_hi(forecast_analysis) if forecast_analysis else None,
+        'forecast_warnings': forecast_analysis['warnings'] if forecast_analysis else [],
+        'state_alerts': state_alerts,
+        # crop name -> insights, filled lazily by format_event
+        'insights': {},
+        # (language, crop names) -> encoded SSE message
+        'messages': {},
+    }
+
+
+def poll_snapshot(city, state, previous=None):
+    """
+    build_snapshot for the channel poller's executor threads, which live
+    outside Django's request cycle: stale or obsolete connections are closed
+    before and after, as the request cycle would
+    """
+    close_old_connections()
+    try:
+        return build_snapshot(city, state, previous)
+    finally:
+        close_old_connections()
+
+
+def format_event(snapshot, crop_names, lang=DEFAULT_LANGUAGE):
+    """SSE message for one client; clients with the same language and crops share the encoding"""
+    from .views import get_crop_weather_insights
+
+    key = (lang, tuple(crop_names))
+    message = snapshot['messages'].get(key)
+    if message is None:
+        for name in crop_names:
+            if name not in snapshot['insights']:
+                snapshot['insights'][name] = get_crop_weather_insights(
+                    name, snapshot['weather'], snapshot['forecast_analysis']
+                )[:2]
+        payload = {
+            'weather': snapshot['weather'],
+            'lang': lang,
+            'forecast_summary': snapshot[f'forecast_summary_{lang}'],
+            'forecast_warnings': snapshot['forecast_warnings'],
+            'state_alerts': localize(snapshot['state_alerts'], lang, fields=('name', 'message')),
+            'crop_insights': [
+                {'crop': name, 'insights': localize(snapshot['insights'][name], lang)}
+                for name in crop_names
+            ],
+        }
+        message = f"event: alerts\ndata: {json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False)}\n\n"
+        snapshot['messages'][key] = message
+    return message
+
+
+class CityChannel:
+    """Subscribers and the single poller for one (city, state)"""
+
+    def __init__(self, city, state):
+        self.city = city
+        self.state = state
+        self.subscribers = set()
+        self.snapshot = None
+        self.task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self.poll())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            if self.task is not None:
+                self.task.cancel()
+            _channels.pop((self.city, self.state), None)
+
+    def publish(self, snapshot):
+        for queue in self.subscribers:
+            # A slow client only ever needs the latest snapshot
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    async def poll(self):
+        fetch = sync_to_async(poll_snapshot, thread_sensitive=False)
+        while self.subscribers:
+            try:
+                snapshot = await fetch(self.city, self.state, self.snapshot)
+            except Exception as e:
+                print(f"Live alerts poll failed for {self.city}: {e}")
+                snapshot = None
+            if snapshot is not None:
+                self.snapshot = snapshot
+                self.publish(snapshot)
+            await asyncio.sleep(settings.LIVE_ALERTS_POLL_SECONDS)
+
+
+_channels = {}
+
+
+async def stream_alerts(city, state, crop_names, lang=DEFAULT_LANGUAGE):
+    """Async iterator of SSE messages for one connected dashboard"""
+    channel = _channels.get((city, state))
+    if channel is None:
+        channel = _channels[(city, state)] = CityChannel(city, state)
+    queue = channel.subscribe()
+
+    try:
+        yield f"retry: {settings.LIVE_ALERTS_POLL_SECONDS * 1000}\n\n"
+        if channel.snapshot is not None:
+            yield format_event(channel.snapshot, crop_names, lang)
+        while True:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), settings.LIVE_ALERTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(snapshot, crop_names, lang)
+    finally:
+        channel.unsubscribe(queue)
+
+
+def single_event(city, state, crop_names, lang=DEFAULT_LANGUAGE):
+    """Body for the WSGI fallback: the current snapshot, then reconnect after one poll interval"""
+    snapshot = build_snapshot(city, state)
+    return f"retry: {settings.LIVE_ALERTS_POLL_SECONDS * 1000}\n\n" + format_event(snapshot, crop_names, lang)
+
+
+def load_subscriber(session_key):
+    """(city, state, crop names) for the session's user, or None when not logged in"""
+    from .middleware import LocationContext
+    from .models import Crop
+
+    try:
+        request = HttpRequest()
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        user = get_user(request)
+        if not user.is_authenticated:
+            return None
+        city, state = LocationContext(user).location
+        crop_names = list(
+            Crop.objects.filter(user=user).order_by('-created_at').values_list('name', flat=True)[:3]
+        )
+        return city, state, crop_names
+    finally:
+        close_old_connections()
+
+
+class LiveAlertsApp:
+    """
+    ASGI wrapper: serves LIVE_ALERTS_PATH directly and passes every other
+    request to Django. Django's ASGI handler keeps a thread per in-flight
+    request, which would mean a thread per idle dashboard.
+    """
+
+    def __init__(self, django_app, path='/api/live-alerts/'):
+        self.django_app = django_app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != self.path:
+            return await self.django_app(scope, receive, send)
+
+        cookies = SimpleCookie()
+        for name, value in scope['headers']:
+            if name == b'cookie':
+                cookies.load(value.decode('latin-1'))
+        session = cookies.get(settings.SESSION_COOKIE_NAME)
+
+        subscriber = None
+        if session:
+            subscriber = await sync_to_async(load_subscriber, thread_sensitive=False)(session.value)
+        if subscriber is None:
+            await send({'type': 'http.response.start', 'status': 403,
+                        'headers': [(b'content-type', b'application/json')]})
+            await send({'type': 'http.response.body', 'body': b'{"error": "Login required"}'})
+            return
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+
+        lang = QueryDict(scope.get('query_string', b'')).get('lang', '').lower()
+        if lang not in LANGUAGES:
+            lang = DEFAULT_LANGUAGE
+
+        async def pump():
+            async for message in stream_alerts(*subscriber, lang):
+                await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+
+        async def wait_for_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        # Whichever finishes first (normally the client leaving) ends the other
+        tasks = [asyncio.create_task(pump()), asyncio.create_task(wait_for_disconnect())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
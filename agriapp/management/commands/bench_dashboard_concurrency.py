@@ -0,0 +1,139 @@
+"""
+Concurrency benchmark: N parallel dashboard clients (plus optional crop writers)
+Reports throughput, latency percentiles and `database is locked` errors.
+Run once with default settings and once with SQLITE_PRODUCTION_MODE=1 to compare.
+The bench_user_N accounts it creates (with their profiles and crops) are
+deleted again when it finishes.
+
+Usage: python manage.py bench_dashboard_concurrency --clients 16 --requests 50 --writers 2
+"""
+
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections
+from django.test import Client
+from django.test.utils import override_settings
+
+from agriapp import views
+from agriapp.models import Crop
+
+
+BENCH_PASSWORD = 'bench-pass-123'
+
+
+class Command(BaseCommand):
+    help = "Benchmark parallel dashboard clients against the configured databases"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=50, help="Requests per client")
+        parser.add_argument('--writers', type=int, default=2, help="Threads adding/removing crops meanwhile")
+        parser.add_argument('--live-weather', action='store_true',
+                            help="Call OpenWeather instead of a fixed reading (adds network time)")
+
+    def handle(self, *args, **options):
+        self.created_user_ids = []
+        try:
+            self.run_benchmark(options)
+        finally:
+            # Profiles and crops go with the users (CASCADE)
+            User.objects.filter(id__in=self.created_user_ids).delete()
+
+    def run_benchmark(self, options):
+        clients = options['clients']
+        per_client = options['requests']
+
+        users = [self.bench_user(i) for i in range(max(clients, options['writers']))]
+
+        original_weather = views.get_weather_data
+        if not options['live_weather']:
+            # Keep the benchmark about database contention, not network latency
+            views.get_weather_data = lambda city="Delhi", priority=None: {
+                'temp': 30, 'humidity': 55, 'description': 'clear sky',
+                'city': city.title(), 'lat': None, 'lon': None,
+            }
+
+        latencies = []
+        locked = [0]
+        other_errors = [0]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def dashboard_client(user):
+            client = Client(raise_request_exception=True)
+            try:
+                client.login(username=user.username, password=BENCH_PASSWORD)
+            except OperationalError:
+                with lock:
+                    locked[0] += per_client
+                return
+            for _ in range(per_client):
+                started = time.perf_counter()
+                try:
+                    client.get('/dashboard/')
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                except OperationalError as e:
+                    with lock:
+                        if 'locked' in str(e):
+                            locked[0] += 1
+                        else:
+                            other_errors[0] += 1
+                except Exception:
+                    with lock:
+                        other_errors[0] += 1
+            close_old_connections()
+
+        def crop_writer(user):
+            while not done.is_set():
+                try:
+                    crop = Crop.objects.create(user=user, name='Bench Wheat', season='Rabi', area=1)
+                    crop.delete()
+                except OperationalError as e:
+                    with lock:
+                        if 'locked' in str(e):
+                            locked[0] += 1
+            close_old_connections()
+
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                writers = [threading.Thread(target=crop_writer, args=(users[i],)) for i in range(options['writers'])]
+                readers = [threading.Thread(target=dashboard_client, args=(users[i],)) for i in range(clients)]
+
+                started = time.perf_counter()
+                for thread in writers + readers:
+                    thread.start()
+                for thread in readers:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+                done.set()
+                for thread in writers:
+                    thread.join()
+        finally:
+            done.set()
+            views.get_weather_data = original_weather
+
+        latencies.sort()
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(f"clients={clients} requests/client={per_client} writers={options['writers']}")
+        self.stdout.write(f"ok={len(latencies)} locked={locked[0]} other_errors={other_errors[0]}")
+        self.stdout.write(f"throughput={len(latencies) / elapsed:.1f} req/s")
+        self.stdout.write(
+            f"p50={percentile(0.50):.1f}ms p95={percentile(0.95):.1f}ms "
+            f"p99={percentile(0.99):.1f}ms max={percentile(1.0):.1f}ms"
+        )
+
+    def bench_user(self, index):
+        user, created = User.objects.get_or_create(username=f'bench_user_{index}')
+        if created:
+            self.created_user_ids.append(user.id)
+            user.set_password(BENCH_PASSWORD)
+            user.save()
+        return user
@@ -0,0 +1,76 @@
+"""
+Rasterize agriapp/data/climate_zones.json into the uint8 climate-zone grid
+
+Every cell centre is classified: arid if inside an arid region, else
+coastal if within coastal_km of a coastline, else inland.
+
+    python manage.py build_climate_raster
+"""
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from agriapp.climate_zones import grid_shape, load_zone_source
+
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON = 111.32
+
+
+def inside_polygon(lats, lons, polygon):
+    """Even-odd ray casting for every grid point at once"""
+    inside = np.zeros(lats.shape, dtype=bool)
+    points = np.asarray(polygon, dtype=float)
+    for (lat1, lon1), (lat2, lon2) in zip(points, np.roll(points, -1, axis=0)):
+        crosses = (lat1 > lats) != (lat2 > lats)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge_lon = lon1 + (lats - lat1) * (lon2 - lon1) / (lat2 - lat1)
+        inside ^= crosses & (lons < edge_lon)
+    return inside
+
+
+def distance_to_line_km(lats, lons, line):
+    """Distance from every grid point to a polyline (local equirectangular projection)"""
+    scale = np.cos(np.radians(lats)) * KM_PER_DEGREE_LON
+    best = np.full(lats.shape, np.inf)
+    points = np.asarray(line, dtype=float)
+    for (lat1, lon1), (lat2, lon2) in zip(points[:-1], points[1:]):
+        # Segment and point in km relative to the segment start
+        dx, dy = (lon2 - lon1) * scale, (lat2 - lat1) * KM_PER_DEGREE_LAT
+        px, py = (lons - lon1) * scale, (lats - lat1) * KM_PER_DEGREE_LAT
+        length = dx * dx + dy * dy
+        t = np.clip((px * dx + py * dy) / np.where(length == 0, 1, length), 0, 1)
+        best = np.minimum(best, np.hypot(px - t * dx, py - t * dy))
+    return best
+
+
+class Command(BaseCommand):
+    help = "Build the memory-mapped climate-zone raster from climate_zones.json"
+
+    def handle(self, *args, **options):
+        source = load_zone_source()
+        grid = source['grid']
+        zones = source['zones']
+        rows, cols = grid_shape(grid)
+
+        half = grid['step'] / 2
+        lats = grid['lat_min'] + half + grid['step'] * np.arange(rows)
+        lons = grid['lon_min'] + half + grid['step'] * np.arange(cols)
+        lats, lons = np.meshgrid(lats, lons, indexing='ij')
+
+        raster = np.full((rows, cols), zones.index('inland'), dtype=np.uint8)
+
+        coast_km = np.full(lats.shape, np.inf)
+        for line in source['coastlines'].values():
+            coast_km = np.minimum(coast_km, distance_to_line_km(lats, lons, line))
+        raster[coast_km <= source['coastal_km']] = zones.index('coastal')
+
+        for polygon in source['arid_regions'].values():
+            raster[inside_polygon(lats, lons, polygon)] = zones.index('arid')
+
+        np.save(settings.CLIMATE_RASTER_FILE, raster)
+
+        counts = {zone: int((raster == code).sum()) for code, zone in enumerate(zones) if code}
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {rows}x{cols} raster ({raster.nbytes // 1024} KB) to {settings.CLIMATE_RASTER_FILE}: {counts}"
+        ))
@@ -0,0 +1,104 @@
+"""
+Precompute each user's daily crop insights, priority actions and farm summary
+Only users whose city weather bucket or crop set changed are recomputed
+
+Usage: python manage.py build_daily_advisories [--city Kanpur] [--force]
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from agriapp.models import Crop, UserProfile, DailyAdvisory
+from agriapp.views import get_weather_and_forecast, get_crop_weather_insights
+from agriapp.upstream_quota import PREFETCH
+from agriapp.weather_archive import weather_anomaly
+from agriapp.weather_forecast import analyze_forecast_unpredictability
+from agriapp.utils import generate_daily_farm_insights
+from agriapp.daily_advisories import weather_bucket, crop_fingerprint, serialize_crop_insights
+
+
+class Command(BaseCommand):
+    help = "Precompute daily advisories for every user (incremental)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--city', help="Only rebuild users in this city")
+        parser.add_argument('--force', action='store_true', help="Recompute even if inputs are unchanged")
+
+    def handle(self, *args, **options):
+        # Group users by city so each city's weather is fetched once
+        users_by_city = defaultdict(list)
+        for user_id, city in UserProfile.objects.values_list('user_id', 'city'):
+            users_by_city[(city or "Delhi").strip().title()].append(user_id)
+
+        if options['city']:
+            only = options['city'].strip().title()
+            users_by_city = {only: users_by_city.get(only, [])}
+
+        recomputed = 0
+        skipped = 0
+
+        for city, user_ids in users_by_city.items():
+            if not user_ids:
+                continue
+
+            weather_data, daily_forecasts = get_weather_and_forecast(city, PREFETCH)
+            forecast_analysis = None
+            if daily_forecasts:
+                forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
+            anomaly = weather_anomaly(city, weather_data)
+            bucket = weather_bucket(weather_data, forecast_analysis, anomaly)
+
+            crops_by_user = defaultdict(list)
+            for crop in Crop.objects.filter(user_id__in=user_ids).order_by('id'):
+                crops_by_user[crop.user_id].append(crop)
+
+            existing = {
+                row.user_id: row
+                for row in DailyAdvisory.objects.filter(user_id__in=user_ids)
+            }
+
+            rows = []
+            for user_id in user_ids:
+                crops = crops_by_user[user_id]
+                fingerprint = crop_fingerprint(crops)
+                row = existing.get(user_id)
+
+                if (not options['force'] and row is not None
+                        and row.city == weather_data['city']
+                        and row.weather_bucket == bucket
+                        and row.crop_fingerprint == fingerprint):
+                    skipped += 1
+                    continue
+
+                all_crop_insights = []
+                for crop in crops:
+                    all_crop_insights.append({
+                        'crop': crop,
+                        'insights': get_crop_weather_insights(crop.name, weather_data, forecast_analysis, anomaly)
+                    })
+                daily_insights = generate_daily_farm_insights(all_crop_insights, weather_data)
+
+                rows.append(DailyAdvisory(
+                    user_id=user_id,
+                    city=weather_data['city'],
+                    weather_bucket=bucket,
+                    crop_fingerprint=fingerprint,
+                    crop_insights=serialize_crop_insights(all_crop_insights),
+                    priority_actions=daily_insights['priority_actions'],
+                    farm_summary=daily_insights['farm_summary'],
+                ))
+
+            if rows:
+                DailyAdvisory.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['user'],
+                    update_fields=['city', 'weather_bucket', 'crop_fingerprint',
+                                   'crop_insights', 'priority_actions', 'farm_summary', 'computed_at'],
+                )
+                recomputed += len(rows)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Daily advisories: {recomputed} recomputed, {skipped} unchanged"
+        ))
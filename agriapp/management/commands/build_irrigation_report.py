@@ -0,0 +1,175 @@
+"""
+Regional irrigation demand report
+Runs the farm planner for every farm and rolls water / urea / seed needs up
+per district into IrrigationDemandReport. Farms are grouped by city so each
+city's weather and forecast is fetched exactly once (concurrently; only the
+HTTP calls run in the pool, quota and database writes stay on the command
+thread), then crops are streamed from the database in user order with flat
+memory.
+
+Usage: python manage.py build_irrigation_report [--date 2026-01-31] [--state Punjab] [--workers 8]
+"""
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from agriapp.climate_zones import DEFAULT_ZONE, climate_zones
+from agriapp.geocoding import get_coordinates
+from agriapp.models import Crop, UserProfile, IrrigationDemandReport
+from agriapp.planner import plan_crop, weather_for_date
+from agriapp.upstream_quota import PREFETCH
+from agriapp.views import estimate_weather, get_weather_and_forecast, get_weather_readings
+from agriapp.weather_archive import record_forecast
+from agriapp.weather_forecast import analyze_forecast_unpredictability, start_forecast
+
+
+def with_analysis(weather_data, forecast_data):
+    forecast_analysis = None
+    if forecast_data:
+        forecast_analysis = analyze_forecast_unpredictability(forecast_data)
+    return weather_data, forecast_data, forecast_analysis
+
+
+def fetch_city_weather(city):
+    """(weather_data, forecast_data, forecast_analysis) for one city"""
+    return with_analysis(*get_weather_and_forecast(city, PREFETCH))
+
+
+def fetch_cities_weather(cities, pool):
+    """
+    {city: (weather_data, forecast_data, forecast_analysis)} for many cities
+    Only request_weather / fetch_forecast run in `pool`
+    """
+    # Forecasts for cities with known coordinates start before the weather readings
+    forecasts = {}
+    for city in cities:
+        coords = get_coordinates(city)
+        if coords is not None:
+            forecasts[city] = start_forecast(*coords, pool, PREFETCH)
+
+    readings, _ = get_weather_readings(cities, PREFETCH, pool)
+    weather = {city: readings[city] or estimate_weather(city) for city in cities}
+    for city, weather_data in weather.items():
+        if city not in forecasts and weather_data.get('lat') and weather_data.get('lon'):
+            forecasts[city] = start_forecast(weather_data['lat'], weather_data['lon'], pool, PREFETCH)
+
+    city_weather = {}
+    for city, weather_data in weather.items():
+        forecast_data = forecasts[city]() if city in forecasts else None
+        record_forecast(city, forecast_data)
+        city_weather[city] = with_analysis(weather_data, forecast_data)
+    return city_weather
+
+
+def normalize_place(value):
+    return (value or "Delhi").strip().title()
+
+
+class Command(BaseCommand):
+    help = "Compute planner outputs for every farm and store per-district totals"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Day to plan for (YYYY-MM-DD), default tomorrow")
+        parser.add_argument('--state', help="Only farms in this state")
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent weather fetches")
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                report_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+        else:
+            report_date = timezone.localdate() + timedelta(days=1)
+
+        # Report rows are keyed by the normalized state; profiles may store any case
+        state_filter = normalize_place(options['state']) if options['state'] else None
+        started = time.monotonic()
+
+        # 1. One weather + forecast fetch per distinct city
+        profiles = UserProfile.objects.all()
+        if state_filter:
+            profiles = profiles.filter(state__iexact=state_filter)
+        cities = {normalize_place(city) for city in profiles.values_list('city', flat=True).distinct()}
+
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            city_weather = fetch_cities_weather(cities, pool)
+
+        planner_weather = {
+            city: (weather_for_date(weather, forecast, report_date), forecast, analysis)
+            for city, (weather, forecast, analysis) in city_weather.items()
+        }
+
+        def weather_for_city(city):
+            # Farms without a profile fall back to Delhi, which may not be prefetched
+            if city not in planner_weather:
+                weather, forecast, analysis = fetch_city_weather(city)
+                planner_weather[city] = (weather_for_date(weather, forecast, report_date), forecast, analysis)
+            return planner_weather[city]
+
+        self.stdout.write(f"Fetched weather for {len(cities)} cities in {time.monotonic() - started:.1f}s")
+
+        # Climate zone of every city in one vectorized raster lookup
+        city_coords = {}
+        for city, (weather, _, _) in city_weather.items():
+            coords = get_coordinates(city) or (weather.get('lat'), weather.get('lon'))
+            if None not in coords:
+                city_coords[city] = coords
+        lats, lons = zip(*city_coords.values()) if city_coords else ((), ())
+        city_zones = dict(zip(city_coords, climate_zones(lats, lons)))
+
+        # 2. Stream every crop plot, ordered by user so farms are counted without a set
+        crops = Crop.objects.all()
+        if state_filter:
+            crops = crops.filter(user__userprofile__state__iexact=state_filter)
+        rows = crops.order_by('user_id').values_list(
+            'user_id', 'name', 'area', 'season', 'user__userprofile__city', 'user__userprofile__state'
+        )
+
+        totals = defaultdict(lambda: {'farms': 0, 'plots': 0, 'total_area': 0.0,
+                                      'water_litres': 0.0, 'urea_kg': 0.0, 'seeds_kg': 0.0})
+        last_user = None
+        plots = 0
+
+        for user_id, name, area, season, city, state in rows.iterator(chunk_size=5000):
+            city = normalize_place(city)
+            district = totals[(normalize_place(state), city)]
+            if user_id != last_user:
+                district['farms'] += 1
+                last_user = user_id
+
+            weather_data, forecast_data, forecast_analysis = weather_for_city(city)
+            area = float(area)
+            plan = plan_crop(name, area, weather_data, forecast_data, forecast_analysis, fallback_season=season,
+                             climate_zone=city_zones.get(city, DEFAULT_ZONE))
+
+            district['plots'] += 1
+            district['total_area'] += area
+            district['water_litres'] += plan['water_needed']
+            district['urea_kg'] += plan['urea_needed']
+            district['seeds_kg'] += plan['seeds_needed']
+            plots += 1
+
+        # 3. Replace the day's report rows in one transaction
+        report_rows = [
+            IrrigationDemandReport(report_date=report_date, state=state, district=district, **values)
+            for (state, district), values in totals.items()
+        ]
+        with transaction.atomic():
+            existing = IrrigationDemandReport.objects.filter(report_date=report_date)
+            if state_filter:
+                existing = existing.filter(state=state_filter)
+            existing.delete()
+            IrrigationDemandReport.objects.bulk_create(report_rows, batch_size=1000)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Irrigation report for {report_date}: {plots} plots in {len(report_rows)} districts "
+            f"in {elapsed:.1f}s ({plots / max(elapsed, 0.001):.0f} plots/s)"
+        ))
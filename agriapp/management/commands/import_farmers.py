@@ -0,0 +1,216 @@
+"""
+Bulk onboard farmers (User + UserProfile) and their crops from CSV or JSONL
+Rows are inserted with bulk_create in chunked transactions, so the per-user
+post_save profile signal never runs. Password hashing is the expensive part;
+it runs in a process pool, one chunk ahead of the database writes.
+
+CSV columns:  username,email,password,state,city,crop,season,area
+              (repeat the username on consecutive rows for more crops)
+JSONL:        {"username": ..., "email": ..., "password": ..., "state": ..., "city": ...,
+               "crops": [{"name": ..., "season": ..., "area": ...}]}
+
+A blank password gives the farmer an unusable password (set later via reset).
+
+Usage: python manage.py import_farmers farmers.csv [--chunk 2000] [--workers 4]
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from agriapp.analytics import invalidate_regional_summary
+from agriapp.models import Crop, UserProfile
+
+
+SEASONS = {choice for choice, _ in Crop.SEASON_CHOICES}
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _hash_passwords(passwords):
+    return [make_password(password or None) for password in passwords]
+
+
+class Command(BaseCommand):
+    help = "Bulk import farmers, profiles and crops from CSV/JSONL without per-row signals"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension")
+        parser.add_argument('--chunk', type=int, default=2000, help="Farmers per transaction")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Password hashing processes")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+
+        input_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        self.workers = max(1, options['workers'])
+        self.stats = {'users': 0, 'crops': 0, 'skipped': 0, 'invalid': 0}
+        self.started = time.monotonic()
+
+        farmers = self.iter_jsonl(path) if input_format == 'jsonl' else self.iter_csv(path)
+        seen = set()
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            pending = None
+            for chunk in self.iter_chunks(farmers, options['chunk'], seen):
+                # Hash this chunk while the previous one is written
+                submitted = (chunk, self.submit_hashes(pool, chunk))
+                if pending:
+                    self.write_chunk(*pending)
+                pending = submitted
+            if pending:
+                self.write_chunk(*pending)
+
+        # bulk_create bypassed the Crop signals
+        invalidate_regional_summary()
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.stats['users']} farmers and {self.stats['crops']} crops in {elapsed:.1f}s "
+            f"({self.stats['users'] / max(elapsed, 0.001):.0f} farmers/s); "
+            f"{self.stats['skipped']} existing/duplicate, {self.stats['invalid']} invalid"
+        ))
+
+    # ---------- input ----------
+
+    def iter_csv(self, path):
+        with open(path, newline='', encoding='utf-8') as f:
+            farmer = None
+            for row in csv.DictReader(f):
+                username = (row.get('username') or '').strip()
+                if farmer is None or username != farmer['username']:
+                    if farmer is not None:
+                        yield farmer
+                    farmer = {
+                        'username': username,
+                        'email': (row.get('email') or '').strip(),
+                        'password': row.get('password') or '',
+                        'state': (row.get('state') or '').strip(),
+                        'city': (row.get('city') or '').strip(),
+                        'crops': [],
+                    }
+                if (row.get('crop') or '').strip():
+                    farmer['crops'].append({
+                        'name': row['crop'], 'season': row.get('season'), 'area': row.get('area'),
+                    })
+            if farmer is not None:
+                yield farmer
+
+    def iter_jsonl(self, path):
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    farmer = json.loads(line)
+                except ValueError:
+                    farmer = None
+                if not isinstance(farmer, dict):
+                    # Unparseable, or valid JSON that is not an object (list, number, string)
+                    self.stats['invalid'] += 1
+                    self.stdout.write(self.style.WARNING(f"Line {number}: not a JSON object, skipped"))
+                    continue
+                farmer['username'] = str(farmer.get('username') or '').strip()
+                yield farmer
+
+    def iter_chunks(self, farmers, size, seen):
+        """Yield lists of new, valid farmers; existing usernames are dropped per chunk"""
+        chunk = []
+        for farmer in farmers:
+            username = farmer['username']
+            if not username or len(username) > 150:
+                self.stats['invalid'] += 1
+                continue
+            if username in seen:
+                self.stats['skipped'] += 1
+                continue
+            seen.add(username)
+            chunk.append(farmer)
+            if len(chunk) >= size:
+                yield self.drop_existing(chunk)
+                chunk = []
+        if chunk:
+            yield self.drop_existing(chunk)
+
+    def drop_existing(self, chunk):
+        existing = set(User.objects.filter(
+            username__in=[farmer['username'] for farmer in chunk]
+        ).values_list('username', flat=True))
+        self.stats['skipped'] += len(existing)
+        return [farmer for farmer in chunk if farmer['username'] not in existing]
+
+    # ---------- hashing ----------
+
+    def submit_hashes(self, pool, chunk):
+        passwords = [str(farmer.get('password') or '') for farmer in chunk]
+        step = max(1, -(-len(passwords) // self.workers))
+        return [pool.submit(_hash_passwords, passwords[i:i + step]) for i in range(0, len(passwords), step)]
+
+    # ---------- writes ----------
+
+    def parse_crop(self, crop):
+        if not isinstance(crop, dict):
+            return None
+        name = str(crop.get('name') or '').strip()
+        season = str(crop.get('season') or '').strip().title()
+        try:
+            area = Decimal(str(crop.get('area')).strip())
+        except (InvalidOperation, TypeError):
+            return None
+        if not name or season not in SEASONS or area <= 0 or area >= 1000:
+            return None
+        return name[:100], season, area.quantize(Decimal('0.01'))
+
+    def write_chunk(self, chunk, futures):
+        hashes = [password for future in futures for password in future.result()]
+
+        users = [
+            User(username=farmer['username'], email=str(farmer.get('email') or ''), password=hashed)
+            for farmer, hashed in zip(chunk, hashes)
+        ]
+
+        with transaction.atomic():
+            # bulk_create skips post_save, so profiles are created here directly
+            User.objects.bulk_create(users, batch_size=500)
+
+            profiles = []
+            crops = []
+            for farmer, user in zip(chunk, users):
+                profiles.append(UserProfile(
+                    user_id=user.pk,
+                    state=str(farmer.get('state') or 'Delhi')[:100],
+                    city=str(farmer.get('city') or 'Delhi')[:100],
+                ))
+                for crop in farmer.get('crops') or []:
+                    parsed = self.parse_crop(crop)
+                    if parsed is None:
+                        self.stats['invalid'] += 1
+                        continue
+                    name, season, area = parsed
+                    crops.append(Crop(user_id=user.pk, name=name, season=season, area=area))
+
+            UserProfile.objects.bulk_create(profiles, batch_size=500)
+            Crop.objects.bulk_create(crops, batch_size=500)
+
+        self.stats['users'] += len(users)
+        self.stats['crops'] += len(crops)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f"{self.stats['users']} farmers, {self.stats['crops']} crops "
+            f"({self.stats['users'] / max(elapsed, 0.001):.0f} farmers/s)"
+        )
@@ -0,0 +1,201 @@
+"""
+Page through the full data.gov.in mandi resource into the local MandiPrice table
+Pages are fetched concurrently by a bounded pool, decoded record by record and
+upserted in large transactions. Progress is checkpointed so a rerun resumes;
+a run that fails part-way stops its workers and keeps the last checkpoint.
+
+Usage: python manage.py ingest_mandi_prices [--workers 4] [--limit 1000] [--restart]
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from agriapp.mandi_store import MANDI_RESOURCE_URL, iter_json_records, store_mandi_records
+
+
+PAGE_DONE = object()
+
+
+class Command(BaseCommand):
+    help = "Bulk ingest the full data.gov.in mandi price resource (resumable)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Pages fetched concurrently")
+        parser.add_argument('--limit', type=int, default=1000, help="Records per page")
+        parser.add_argument('--batch', type=int, default=10000, help="Rows per write transaction")
+        parser.add_argument('--max-pages', type=int, default=None, help="Stop after this many pages")
+        parser.add_argument('--checkpoint', default=str(settings.BASE_DIR / 'mandi_ingest_checkpoint.json'))
+        parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start at offset 0")
+
+    def handle(self, *args, **options):
+        self.limit = options['limit']
+        self.local = threading.local()
+        checkpoint_path = options['checkpoint']
+
+        start_offset = 0 if options['restart'] else self.read_checkpoint(checkpoint_path)
+        if start_offset:
+            self.stdout.write(f"Resuming from offset {start_offset}")
+
+        # Bounded queue: workers block instead of buffering whole pages
+        records = self.records = queue.Queue(maxsize=options['batch'] * 2)
+        stop = threading.Event()
+        # Set when the main thread fails, so workers stop waiting on the full queue
+        self.abort = threading.Event()
+        workers = max(1, options['workers'])
+        max_pages = options['max_pages']
+
+        next_page = [0]
+        page_lock = threading.Lock()
+
+        def claim_offset():
+            with page_lock:
+                if stop.is_set() or (max_pages is not None and next_page[0] >= max_pages):
+                    return None
+                offset = start_offset + next_page[0] * self.limit
+                next_page[0] += 1
+                return offset
+
+        def worker():
+            while True:
+                offset = claim_offset()
+                if offset is None:
+                    return
+                count = self.fetch_page(offset)
+                if count is None or count < self.limit:
+                    stop.set()  # short, empty or failed page: nothing left to schedule
+                if not self.put((PAGE_DONE, offset, count)):
+                    return
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = [pool.submit(worker) for _ in range(workers)]
+
+        started = time.monotonic()
+        total_rows = 0
+        buffer = []
+        received_pages = {}
+        committed_offset = start_offset
+        failed_offsets = []
+
+        def flush():
+            nonlocal total_rows, committed_offset
+            if buffer:
+                with transaction.atomic():
+                    store_mandi_records(buffer, batch_size=2000)
+                total_rows += len(buffer)
+                buffer.clear()
+
+            # Every page whose end marker arrived is now fully committed
+            while committed_offset in received_pages:
+                count = received_pages.pop(committed_offset)
+                if count is None:
+                    break
+                committed_offset += count
+                if count < self.limit:
+                    break  # a short page is the end of the data; a resume starts right after it
+            self.write_checkpoint(checkpoint_path, committed_offset)
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"{total_rows} rows, offset {committed_offset}, {total_rows / max(elapsed, 0.001):.0f} rows/s"
+            )
+
+        finished = False
+        try:
+            while True:
+                try:
+                    item = records.get(timeout=0.5)
+                except queue.Empty:
+                    if all(future.done() for future in futures) and records.empty():
+                        break
+                    continue
+
+                if isinstance(item, tuple) and item and item[0] is PAGE_DONE:
+                    _, offset, count = item
+                    received_pages[offset] = count
+                    if count is None:
+                        failed_offsets.append(offset)
+                    continue
+
+                buffer.append(item)
+                if len(buffer) >= options['batch']:
+                    flush()
+            finished = True
+        finally:
+            if not finished:
+                # Uncommitted rows are dropped; the checkpoint still points at the last flush
+                stop.set()
+                self.abort.set()
+            pool.shutdown()
+        flush()
+
+        elapsed = time.monotonic() - started
+        if failed_offsets:
+            self.stdout.write(self.style.WARNING(
+                f"Pages failed at offsets {sorted(failed_offsets)}; rerun to resume from {committed_offset}"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {total_rows} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 0.001):.0f} rows/s)"
+        ))
+
+    def put(self, item):
+        """Queue an item for the main thread; False once the run is aborted"""
+        while not self.abort.is_set():
+            try:
+                self.records.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_page(self, offset, retries=3):
+        """
+        Stream one page into the queue
+        Returns the record count, or None if the page kept failing (or the run was aborted)
+        """
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = requests.Session()
+
+        params = {
+            "api-key": settings.MANDI_API_KEY,
+            "format": "json",
+            "offset": offset,
+            "limit": self.limit,
+        }
+
+        for attempt in range(retries):
+            if self.abort.is_set():
+                return None
+            count = 0
+            try:
+                with session.get(MANDI_RESOURCE_URL, params=params, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    for record in iter_json_records(response):
+                        if not self.put(record):
+                            return None
+                        count += 1
+                return count
+            except Exception as e:
+                # Records queued before the failure are simply upserted again on retry
+                print(f"Mandi page {offset} attempt {attempt + 1} failed: {e}")
+                time.sleep(2 ** attempt)
+        return None
+
+    def read_checkpoint(self, path):
+        try:
+            with open(path) as f:
+                return int(json.load(f).get('offset', 0))
+        except (OSError, ValueError):
+            return 0
+
+    def write_checkpoint(self, path, offset):
+        with open(path, 'w') as f:
+            json.dump({'offset': offset}, f)
@@ -0,0 +1,54 @@
+"""
+Maintain MandiPriceRollup incrementally from newly ingested mandi rows
+Only periods touched by rows updated since the last run are recomputed
+
+Usage: python manage.py rollup_mandi_prices [--full]
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from agriapp.mandi_rollups import rebuild_rollups
+
+
+# Re-read a small window before the watermark so rows committed late are not missed
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = "Update daily/weekly/monthly mandi price rollups from new mandi rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rebuild every rollup from scratch")
+        parser.add_argument('--checkpoint', default=str(settings.BASE_DIR / 'mandi_rollup_checkpoint.json'))
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        since = None if options['full'] else self.read_checkpoint(checkpoint_path)
+        run_started = timezone.now()
+        started = time.monotonic()
+
+        with transaction.atomic():
+            written = rebuild_rollups(since - WATERMARK_OVERLAP if since else None)
+
+        self.write_checkpoint(checkpoint_path, run_started)
+        self.stdout.write(self.style.SUCCESS(
+            f"Mandi rollups: {written} rows updated in {time.monotonic() - started:.1f}s"
+        ))
+
+    def read_checkpoint(self, path):
+        try:
+            with open(path) as f:
+                return datetime.fromisoformat(json.load(f)['since'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write_checkpoint(self, path, since):
+        with open(path, 'w') as f:
+            json.dump({'since': since.isoformat()}, f)
@@ -0,0 +1,37 @@
+"""
+Downsample archived weather readings into daily and monthly rollups,
+then prune raw readings older than settings.WEATHER_RAW_RETENTION_DAYS
+
+Usage: python manage.py rollup_weather [--days 2] [--full]
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from agriapp.weather_archive import prune_observations, rollup_days, rollup_months
+
+
+class Command(BaseCommand):
+    help = "Update daily/monthly weather rollups from archived readings and prune old readings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help="Recompute this many recent days (default 2)")
+        parser.add_argument('--full', action='store_true', help="Recompute every day still in the raw archive")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        since = None if options['full'] else timezone.localdate() - timedelta(days=max(0, options['days'] - 1))
+
+        with transaction.atomic():
+            months = rollup_days(since)
+            monthly = rollup_months(months)
+        pruned = prune_observations()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Weather rollups: {len(months)} city-months, {monthly} monthly rows updated, "
+            f"{pruned} old readings pruned in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,157 @@
+"""
+Mandi Price Rollups
+Daily, weekly and monthly min / max / median modal price per
+(commodity, state) and (commodity, district), kept in MandiPriceRollup
+so price trends never have to scan raw mandi history
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from statistics import median
+
+from .models import MandiPrice, MandiPriceRollup
+
+
+ROLLUP_PERIODS = ['day', 'week', 'month']
+
+ROLLUP_UPDATE_FIELDS = ['min_price', 'max_price', 'median_price', 'record_count', 'updated_at']
+
+
+def period_start(period, day):
+    """First date of the day / week (Monday) / month containing `day`"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def period_end(period, start):
+    """First date after the period that begins at `start`"""
+    if period == 'week':
+        return start + timedelta(days=7)
+    if period == 'month':
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _affected_keys(changed_rows):
+    """
+    Map (commodity, state) -> set of (period, period_start, district)
+    district '' stands for the state-wide rollup
+    """
+    affected = defaultdict(set)
+    for commodity, state, district, arrival_date in changed_rows:
+        for period in ROLLUP_PERIODS:
+            start = period_start(period, arrival_date)
+            affected[(commodity, state)].add((period, start, ''))
+            if district:
+                affected[(commodity, state)].add((period, start, district))
+    return affected
+
+
+def rebuild_rollups(since=None):
+    """
+    Recompute every rollup touched by MandiPrice rows updated at or after `since`
+    (all rows when since is None). Returns the number of rollup rows written
+    """
+    changed = MandiPrice.objects.all()
+    if since is not None:
+        changed = changed.filter(updated_at__gte=since)
+    changed_rows = changed.values_list('commodity', 'state', 'district', 'arrival_date').distinct()
+
+    written = 0
+    for (commodity, state), keys in _affected_keys(changed_rows.iterator()).items():
+        range_start = min(start for _, start, _ in keys)
+        range_end = max(period_end(period, start) for period, start, _ in keys)
+
+        # One indexed (commodity, state, date) scan per pair covers every affected period
+        prices = defaultdict(list)
+        rows = MandiPrice.objects.filter(
+            commodity=commodity, state=state,
+            arrival_date__gte=range_start, arrival_date__lt=range_end,
+        ).values_list('district', 'arrival_date', 'modal_price')
+
+        for district, arrival_date, modal_price in rows.iterator():
+            for period in ROLLUP_PERIODS:
+                start = period_start(period, arrival_date)
+                if (period, start, '') in keys:
+                    prices[(period, start, '')].append(modal_price)
+                # A row without a district only counts towards the state-wide rollup
+                if district and (period, start, district) in keys:
+                    prices[(period, start, district)].append(modal_price)
+
+        rollups = []
+        for (period, start, district), values in prices.items():
+            rollups.append(MandiPriceRollup(
+                period=period,
+                period_start=start,
+                commodity=commodity,
+                state=state,
+                district=district,
+                min_price=min(values),
+                max_price=max(values),
+                median_price=Decimal(median(values)).quantize(Decimal('0.01')),
+                record_count=len(values),
+            ))
+
+        if rollups:
+            MandiPriceRollup.objects.bulk_create(
+                rollups,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['commodity', 'state', 'district', 'period', 'period_start'],
+                update_fields=ROLLUP_UPDATE_FIELDS,
+            )
+            written += len(rollups)
+
+    return written
+
+
+def get_price_trend(commodity, state, district=None, period='week', points=12):
+    """
+    Latest `points` rollups for a commodity, oldest first, plus a verdict
+    on how the latest day compares with the typical price over the window
+    Reads only MandiPriceRollup, so cost does not grow with history
+    """
+    if period not in ROLLUP_PERIODS:
+        period = 'week'
+
+    base = MandiPriceRollup.objects.filter(commodity=commodity, state=state, district=district or '')
+
+    series = list(
+        base.filter(period=period)
+        .order_by('-period_start')
+        .values('period_start', 'min_price', 'max_price', 'median_price', 'record_count')[:points]
+    )
+    series.reverse()
+
+    latest_day = (base.filter(period='day')
+                  .order_by('-period_start')
+                  .values('period_start', 'median_price')
+                  .first())
+
+    verdict = None
+    change_percent = None
+    if latest_day and series:
+        typical = median(row['median_price'] for row in series)
+        if typical:
+            change_percent = round(float((latest_day['median_price'] - typical) / typical * 100), 1)
+            if change_percent >= 5:
+                verdict = 'GOOD'
+            elif change_percent <= -5:
+                verdict = 'LOW'
+            else:
+                verdict = 'AVERAGE'
+
+    return {
+        'commodity': commodity,
+        'state': state,
+        'district': district or '',
+        'period': period,
+        'series': series,
+        'latest_day': latest_day,
+        'change_percent': change_percent,
+        'verdict': verdict,
+    }
@@ -0,0 +1,204 @@
+"""
+Local Mandi Price Store
+Persists data.gov.in mandi records into the indexed MandiPrice table
+so price history can be answered from SQLite without the live API
+"""
+
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import MandiPrice
+
+
+MANDI_RESOURCE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+
+MANDI_UNIQUE_FIELDS = ['state', 'district', 'market', 'commodity', 'variety', 'arrival_date']
+MANDI_UPDATE_FIELDS = ['min_price', 'max_price', 'modal_price', 'updated_at']
+
+MANDI_DISPLAY_FIELDS = [
+    'state', 'district', 'market', 'commodity', 'variety', 'arrival_date',
+    'min_price', 'max_price', 'modal_price',
+]
+
+MANDI_SORT_ORDERS = {
+    'date': ('-arrival_date', '-modal_price', 'market'),
+    'price_high': ('-modal_price', '-arrival_date', 'market'),
+    'price_low': ('modal_price', '-arrival_date', 'market'),
+}
+
+
+def _parse_price(value):
+    try:
+        return Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def parse_mandi_record(record):
+    """
+    Convert one API record into MandiPrice field values
+    Returns None for records with a missing date or price
+    """
+    try:
+        arrival_date = datetime.strptime(record['arrival_date'].strip(), '%d/%m/%Y').date()
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+    prices = [_parse_price(record.get(key)) for key in ('min_price', 'max_price', 'modal_price')]
+    if None in prices:
+        return None
+
+    return {
+        'state': (record.get('state') or '').strip(),
+        'district': (record.get('district') or '').strip(),
+        'market': (record.get('market') or '').strip(),
+        'commodity': (record.get('commodity') or '').strip(),
+        'variety': (record.get('variety') or '').strip(),
+        'arrival_date': arrival_date,
+        'min_price': prices[0],
+        'max_price': prices[1],
+        'modal_price': prices[2],
+    }
+
+
+def store_mandi_records(records, batch_size=1000):
+    """
+    Upsert API records into MandiPrice
+    Returns the number of rows written
+    """
+    rows = {}
+    for record in records:
+        values = parse_mandi_record(record)
+        if values:
+            key = tuple(values[field] for field in MANDI_UNIQUE_FIELDS)
+            rows[key] = MandiPrice(**values)
+
+    if not rows:
+        return 0
+
+    MandiPrice.objects.bulk_create(
+        list(rows.values()),
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=MANDI_UNIQUE_FIELDS,
+        update_fields=MANDI_UPDATE_FIELDS,
+    )
+    return len(rows)
+
+
+def get_price_history(commodity, state=None, district=None, days=30):
+    """
+    Daily price rows for a commodity, oldest first
+    Served by the (commodity, state, date) and (district, date) indexes
+    """
+    since = timezone.localdate() - timedelta(days=days)
+
+    if district:
+        queryset = MandiPrice.objects.filter(district=district, arrival_date__gte=since, commodity=commodity)
+    else:
+        queryset = MandiPrice.objects.filter(commodity=commodity, arrival_date__gte=since)
+        if state:
+            queryset = queryset.filter(state=state)
+
+    return list(queryset.order_by('arrival_date').values(
+        'arrival_date', 'market', 'district', 'state', 'variety',
+        'min_price', 'max_price', 'modal_price'
+    ))
+
+
+def iter_json_records(response, chunk_size=64 * 1024):
+    """
+    Yield objects of the top-level "records" array from a streamed response
+    Decodes one record at a time so a whole page is never held in memory
+    """
+    decoder = json.JSONDecoder()
+    response.encoding = response.encoding or 'utf-8'
+    buffer = ''
+    in_records = False
+
+    for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+        buffer += chunk
+
+        if not in_records:
+            start = buffer.find('"records"')
+            bracket = buffer.find('[', start) if start != -1 else -1
+            if bracket == -1:
+                # Keep a tail in case the key is split across chunks
+                buffer = buffer[start:] if start != -1 else buffer[-16:]
+                continue
+            buffer = buffer[bracket + 1:]
+            in_records = True
+
+        pos = 0
+        length = len(buffer)
+        while True:
+            while pos < length and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= length:
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # incomplete object, wait for the next chunk
+            yield record
+        buffer = buffer[pos:]
+
+
+def is_local_data_fresh(state):
+    """
+    True when the state's rows were ingested recently (one (state, updated_at)
+    index lookup). A fresh state is served locally with search_local_mandi's
+    fallbacks; an empty or stale one is fetched live instead
+    """
+    if not state:
+        return False
+    max_age = timedelta(hours=getattr(settings, 'MANDI_LOCAL_MAX_AGE_HOURS', 24))
+    latest = MandiPrice.objects.filter(state=state).aggregate(latest=Max('updated_at'))['latest']
+    return latest is not None and timezone.now() - latest <= max_age
+
+
+def filter_mandi_prices(state, commodity=None, district=None, sort='date'):
+    """Exact-filter MandiPrice queryset (no fallbacks), ordered for display"""
+    queryset = MandiPrice.objects.filter(state=state)
+    if commodity:
+        queryset = queryset.filter(commodity=commodity)
+    if district:
+        queryset = queryset.filter(district__in=[district, district.upper()])
+    return queryset.order_by(*MANDI_SORT_ORDERS.get(sort, MANDI_SORT_ORDERS['date']))
+
+
+def search_local_mandi(state, commodity, district, sort='date', page=1, per_page=50):
+    """
+    Local equivalent of the live mandi search, including the
+    district -> state -> other-crops fallbacks
+    Returns (page_obj, message)
+    """
+    order = MANDI_SORT_ORDERS.get(sort, MANDI_SORT_ORDERS['date'])
+    base = MandiPrice.objects.filter(state=state)
+    msg = ""
+
+    queryset = base
+    if commodity:
+        queryset = queryset.filter(commodity=commodity)
+
+    if district:
+        by_district = queryset.filter(district__in=[district, district.upper()])
+        if by_district.exists():
+            queryset = by_district
+        elif queryset.exists():
+            msg = f"'{district}' me koi market nahi mila. Hum aapke state '{state}' ki baaki mandiyan dikha rahe hain."
+
+    if not queryset.exists():
+        queryset = base
+        msg = f"'{commodity}' ka rate abhi update nahi hua hai. Aapke state ki dusri fasalon ka rate dekhein."
+
+    paginator = Paginator(queryset.order_by(*order).values(*MANDI_DISPLAY_FIELDS), per_page)
+    return paginator.get_page(page), msg
@@ -0,0 +1,46 @@
+"""
+Per-request User Location Context
+Loads the user's (city, state) lazily, at most once per request, and only
+for views that read it. Nothing is kept between requests, so a profile
+change is seen by every worker on its next request. No view edits the
+signed-in user's profile mid-request, so there is nothing to invalidate.
+"""
+
+from django.utils.functional import cached_property
+
+from .models import UserProfile
+
+
+DEFAULT_LOCATION = ("Delhi", "Delhi")
+
+
+class LocationContext:
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def location(self):
+        if not self.user.is_authenticated:
+            return DEFAULT_LOCATION
+
+        row = UserProfile.objects.filter(user_id=self.user.pk).values_list('city', 'state').first()
+        return (row[0] or "Delhi", row[1] or "Delhi") if row else DEFAULT_LOCATION
+
+    @property
+    def city(self):
+        return self.location[0]
+
+    @property
+    def state(self):
+        return self.location[1]
+
+
+class UserLocationMiddleware:
+    """Attach request.location; nothing is queried until a view reads it"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.location = LocationContext(request.user)
+        return self.get_response(request)
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agriapp', '0005_dailyadvisory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MandiPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(max_length=100)),
+                ('district', models.CharField(max_length=100)),
+                ('market', models.CharField(max_length=150)),
+                ('commodity', models.CharField(max_length=100)),
+                ('variety', models.CharField(blank=True, default='', max_length=100)),
+                ('arrival_date', models.DateField()),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('modal_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['commodity', 'state', 'arrival_date'], name='mandi_comm_state_date_idx'), models.Index(fields=['district', 'arrival_date'], name='mandi_district_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('state', 'district', 'market', 'commodity', 'variety', 'arrival_date'), name='unique_mandi_price_per_day')],
+            },
+        ),
+    ]
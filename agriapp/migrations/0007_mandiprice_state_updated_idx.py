@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agriapp', '0006_mandiprice'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mandiprice',
+            index=models.Index(fields=['state', 'updated_at'], name='mandi_state_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agriapp', '0008_mandipricerollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IrrigationDemandReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_date', models.DateField()),
+                ('state', models.CharField(max_length=100)),
+                ('district', models.CharField(max_length=100)),
+                ('farms', models.PositiveIntegerField(default=0)),
+                ('plots', models.PositiveIntegerField(default=0)),
+                ('total_area', models.FloatField(default=0)),
+                ('water_litres', models.FloatField(default=0)),
+                ('urea_kg', models.FloatField(default=0)),
+                ('seeds_kg', models.FloatField(default=0)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('report_date', 'state', 'district'), name='unique_irrigation_report_district')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agriapp', '0010_placecoordinate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100)),
+                ('observed_at', models.DateTimeField()),
+                ('temp', models.FloatField()),
+                ('humidity', models.PositiveSmallIntegerField()),
+                ('description', models.CharField(max_length=50)),
+                ('rain', models.BooleanField(default=False)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['city', 'observed_at'], name='weather_obs_city_time_idx'), models.Index(fields=['observed_at'], name='weather_obs_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100)),
+                ('period', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('source', models.CharField(choices=[('observed', 'Observed'), ('forecast', 'Forecast')], default='observed', max_length=8)),
+                ('temp_min', models.FloatField()),
+                ('temp_max', models.FloatField()),
+                ('temp_mean', models.FloatField()),
+                ('humidity_mean', models.FloatField()),
+                ('rain_fraction', models.FloatField(default=0)),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('city', 'period', 'period_start'), name='unique_weather_rollup_period')],
+            },
+        ),
+    ]
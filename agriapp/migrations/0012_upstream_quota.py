@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agriapp', '0011_weather_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpstreamQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.CharField(max_length=30, unique=True)),
+                ('day', models.DateField()),
+                ('used', models.PositiveIntegerField(default=0)),
+                ('denied', models.PositiveIntegerField(default=0)),
+                ('tokens', models.FloatField()),
+                ('refilled_at', models.DateTimeField()),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
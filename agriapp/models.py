@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 class Crop(models.Model):
@@ -28,6 +29,15 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.city}, {self.state}"
 
+@receiver([post_save, post_delete], sender=Crop)
+def invalidate_crop_analytics(sender, instance, **kwargs):
+    """
+    Crop acreage changed - drop cached regional analytics
+    """
+    from .analytics import invalidate_regional_summary
+    invalidate_regional_summary()
+
+
 @receiver(post_save, sender=User)
 def create_or_update_user_profile(sender, instance, created, **kwargs):
     """
@@ -35,9 +45,208 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
     """
     if created:
         UserProfile.objects.create(user=instance, state='Delhi', city='Delhi')
+    elif kwargs.get('update_fields') == frozenset({'last_login'}):
+        # Login only touches last_login - nothing to do for the profile
+        return
     else:
         # Ensure profile exists for existing users
-        try:
-            instance.userprofile.save()
-        except UserProfile.DoesNotExist:
-            UserProfile.objects.create(user=instance, state='Delhi', city='Delhi')
\ No newline at end of file
+        UserProfile.objects.get_or_create(user=instance, defaults={'state': 'Delhi', 'city': 'Delhi'})
+
+class DailyAdvisory(models.Model):
+    """
+    Precomputed weather advisories for one user
+    Built offline by `manage.py build_daily_advisories`
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    city = models.CharField(max_length=100)
+    weather_bucket = models.CharField(max_length=64)
+    crop_fingerprint = models.CharField(max_length=64)
+    crop_insights = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    priority_actions = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    farm_summary = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.city} ({self.weather_bucket})"
+
+
+class MandiPrice(models.Model):
+    """
+    One data.gov.in mandi record (market, commodity, variety, day)
+    Upserted from every fetch so trends can be served locally
+    """
+    state = models.CharField(max_length=100)
+    district = models.CharField(max_length=100)
+    market = models.CharField(max_length=150)
+    commodity = models.CharField(max_length=100)
+    variety = models.CharField(max_length=100, blank=True, default='')
+    arrival_date = models.DateField()
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    modal_price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['state', 'district', 'market', 'commodity', 'variety', 'arrival_date'],
+                name='unique_mandi_price_per_day',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['commodity', 'state', 'arrival_date'], name='mandi_comm_state_date_idx'),
+            models.Index(fields=['district', 'arrival_date'], name='mandi_district_date_idx'),
+            models.Index(fields=['state', 'updated_at'], name='mandi_state_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.commodity} @ {self.market} ({self.arrival_date}): ₹{self.modal_price}"
+
+
+class MandiPriceRollup(models.Model):
+    """
+    Daily / weekly / monthly modal price summary for a commodity
+    district is blank for the state-wide rollup
+    Maintained incrementally by `manage.py rollup_mandi_prices`
+    """
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    commodity = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    district = models.CharField(max_length=100, blank=True, default='')
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    median_price = models.DecimalField(max_digits=10, decimal_places=2)
+    record_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['commodity', 'state', 'district', 'period', 'period_start'],
+                name='unique_mandi_rollup_period',
+            ),
+        ]
+
+    def __str__(self):
+        place = self.district or self.state
+        return f"{self.commodity} {place} {self.period} {self.period_start}: ₹{self.median_price}"
+
+
+class IrrigationDemandReport(models.Model):
+    """
+    Farm planner totals rolled up per district for one day
+    Written by `manage.py build_irrigation_report`
+    """
+    report_date = models.DateField()
+    state = models.CharField(max_length=100)
+    district = models.CharField(max_length=100)
+    farms = models.PositiveIntegerField(default=0)
+    plots = models.PositiveIntegerField(default=0)
+    total_area = models.FloatField(default=0)
+    water_litres = models.FloatField(default=0)
+    urea_kg = models.FloatField(default=0)
+    seeds_kg = models.FloatField(default=0)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['report_date', 'state', 'district'], name='unique_irrigation_report_district'),
+        ]
+
+    def __str__(self):
+        return f"{self.report_date} {self.district}, {self.state}: {self.water_litres:.0f} L"
+
+
+class PlaceCoordinate(models.Model):
+    """
+    Coordinates learnt from upstream weather responses for places missing
+    from the bundled agriapp/data/places.json
+    """
+    name = models.CharField(max_length=100, unique=True)  # normalized place name
+    lat = models.FloatField()
+    lon = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.lat}, {self.lon})"
+
+
+class WeatherObservation(models.Model):
+    """
+    One current-weather reading received from upstream
+    Downsampled into WeatherRollup and pruned by `manage.py rollup_weather`
+    """
+    city = models.CharField(max_length=100)
+    observed_at = models.DateTimeField()
+    temp = models.FloatField()
+    humidity = models.PositiveSmallIntegerField()
+    description = models.CharField(max_length=50)
+    rain = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'observed_at'], name='weather_obs_city_time_idx'),
+            models.Index(fields=['observed_at'], name='weather_obs_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.city} {self.observed_at:%Y-%m-%d %H:%M}: {self.temp}°C"
+
+
+class WeatherRollup(models.Model):
+    """
+    Daily / monthly weather summary for a city
+    Daily rows come from observations, or from the forecast until the day is observed
+    """
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('month', 'Month'),
+    ]
+    SOURCE_CHOICES = [
+        ('observed', 'Observed'),
+        ('forecast', 'Forecast'),
+    ]
+
+    city = models.CharField(max_length=100)
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    source = models.CharField(max_length=8, choices=SOURCE_CHOICES, default='observed')
+    temp_min = models.FloatField()
+    temp_max = models.FloatField()
+    temp_mean = models.FloatField()
+    humidity_mean = models.FloatField()
+    rain_fraction = models.FloatField(default=0)  # share of readings (days for months) with rain
+    sample_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['city', 'period', 'period_start'], name='unique_weather_rollup_period'),
+        ]
+
+    def __str__(self):
+        return f"{self.city} {self.period} {self.period_start} ({self.source}): {self.temp_mean:.1f}°C"
+
+
+class UpstreamQuota(models.Model):
+    """
+    Call budget shared by every worker for one upstream API (see upstream_quota.py)
+    Updated with compare-and-set on `version`, so no row lock is needed
+    """
+    service = models.CharField(max_length=30, unique=True)
+    day = models.DateField()
+    used = models.PositiveIntegerField(default=0)
+    denied = models.PositiveIntegerField(default=0)
+    tokens = models.FloatField()
+    refilled_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.service} {self.day}: {self.used} used, {self.denied} denied"
@@ -0,0 +1,197 @@
+"""
+Farm Resource Planner
+Per-crop water, urea and seed needs with weather-based adjustments
+Shared by the farm_planner view and the regional irrigation report
+"""
+
+from .crop_weather_rules import get_crop_rules
+from .utils import apply_location_adjustment
+
+
+# Litres per acre by water requirement (anything else counts as LOW)
+BASE_WATER_FACTORS = {'HIGH': 15000, 'MEDIUM': 12000}
+LOW_WATER_FACTOR = 8000
+FALLBACK_WATER_FACTOR = 12000
+BASE_UREA_FACTOR = 45
+BASE_SEEDS_FACTOR = 40
+
+
+def base_water_factor(crop_rules):
+    """Litres per acre before weather adjustments"""
+    if not crop_rules:
+        return FALLBACK_WATER_FACTOR
+    return BASE_WATER_FACTORS.get(crop_rules.get('water_requirement', 'MEDIUM'), LOW_WATER_FACTOR)
+
+
+def is_rain_day(day):
+    """Forecast rows flag rain with a bool; a numeric percentage counts above 50"""
+    probability = day.get('rain_probability', 0)
+    if isinstance(probability, bool):
+        return probability
+    return probability > 50
+
+
+def plan_crop(crop_name, area, weather_data, forecast_data=None, forecast_analysis=None,
+              state_risks=None, fallback_season=None, climate_zone=None):
+    """
+    Plan one crop plot (area in acres) for the given weather
+    climate_zone (coastal / inland / arid) scales water and urea for the farm's location
+    Returns raw numbers plus the alerts / advice shown on the planner page
+    """
+    crop_name = crop_name.strip().title()
+    state_risks = state_risks or []
+
+    # Get crop rules
+    crop_rules = get_crop_rules(crop_name)
+
+    if crop_rules:
+        season = crop_rules.get('season', 'General')
+    else:
+        # Fallback values
+        season = fallback_season or 'General'
+    water_factor = base_water_factor(crop_rules)
+
+    # Weather-based adjustments
+    temp = weather_data.get('temp', 25)
+    humidity = weather_data.get('humidity', 65)
+    description = weather_data.get('description', 'clear sky').lower()
+
+    water_multiplier = 1.0
+    weather_alerts = []
+    irrigation_advice = "Normal irrigation schedule"
+    irrigation_advice_hi = "सामान्य सिंचाई कार्यक्रम"
+    water_saved = 0
+
+    # 1. RAIN DETECTION (current weather)
+    if 'rain' in description or 'drizzle' in description:
+        water_multiplier = 0.0
+        weather_alerts.append({
+            'type': 'info',
+            'icon': '🌧️',
+            'message_en': 'Rain expected - Skip irrigation today',
+            'message_hi': 'बारिश की उम्मीद - आज सिंचाई छोड़ें'
+        })
+        irrigation_advice = "SKIP IRRIGATION - Rain will provide water"
+        irrigation_advice_hi = "सिंचाई छोड़ें - बारिश पानी देगी"
+        water_saved = water_factor * area
+
+    # 2. FORECAST RAIN CHECK (only if no current rain)
+    elif forecast_data and water_multiplier > 0:
+        try:
+            upcoming_rain_days = sum(1 for day in forecast_data[:3] if is_rain_day(day))
+            if upcoming_rain_days >= 2:
+                water_multiplier = 0.7
+                weather_alerts.append({
+                    'type': 'info',
+                    'icon': '🌦️',
+                    'message_en': f'Rain expected in next {upcoming_rain_days} days - Reduce irrigation',
+                    'message_hi': f'अगले {upcoming_rain_days} दिनों में बारिश की उम्मीद - सिंचाई कम करें'
+                })
+                irrigation_advice = "Light irrigation only - Rain coming soon"
+                irrigation_advice_hi = "हल्की सिंचाई - जल्द बारिश आएगी"
+        except Exception as e:
+            print(f"Forecast check error: {e}")
+
+    # 3. HIGH TEMPERATURE (only apply if not already adjusted for rain)
+    if temp > 35 and water_multiplier > 0:
+        water_multiplier = max(water_multiplier, 1.2)
+        weather_alerts.append({
+            'type': 'warning',
+            'icon': '🔥',
+            'message_en': f'High temperature ({temp}°C) - Increase watering by 20%',
+            'message_hi': f'उच्च तापमान ({temp}°C) - पानी 20% बढ़ाएं'
+        })
+        if irrigation_advice == "Normal irrigation schedule":
+            irrigation_advice = "EXTRA watering needed - Water early morning (before 7 AM)"
+            irrigation_advice_hi = "अतिरिक्त पानी चाहिए - सुबह जल्दी पानी दें (7 बजे से पहले)"
+
+    # 4. EXTENDED HEAT
+    if forecast_analysis and forecast_analysis.get('max_consecutive_hot', 0) >= 3 and water_multiplier > 0:
+        water_multiplier = max(water_multiplier, 1.3)
+        weather_alerts.append({
+            'type': 'danger',
+            'icon': '🌡️',
+            'message_en': f'Extended heat ({forecast_analysis["max_consecutive_hot"]} days) - Plan extra water',
+            'message_hi': f'लंबी गर्मी ({forecast_analysis["max_consecutive_hot"]} दिन) - अतिरिक्त पानी की योजना बनाएं'
+        })
+
+    # 5. HIGH HUMIDITY (only reduce if not already at 0)
+    if humidity > 80 and water_multiplier > 0:
+        water_multiplier *= 0.9
+        weather_alerts.append({
+            'type': 'info',
+            'icon': '💧',
+            'message_en': f'High humidity ({humidity}%) - Reduce watering slightly',
+            'message_hi': f'अधिक नमी ({humidity}%) - पानी थोड़ा कम करें'
+        })
+
+    # 6. LOW TEMPERATURE (only reduce if not already at 0)
+    if temp < 15 and water_multiplier > 0:
+        water_multiplier *= 0.8
+        weather_alerts.append({
+            'type': 'info',
+            'icon': '❄️',
+            'message_en': f'Cool weather ({temp}°C) - Less water needed',
+            'message_hi': f'ठंडा मौसम ({temp}°C) - कम पानी चाहिए'
+        })
+
+    # STATE RISK ALERTS
+    state_alert = None
+    for risk in state_risks:
+        if risk.get('advisory_key') in ['HEATWAVE_RISK', 'HEAVY_RAINFALL', 'FLOOD_RISK', 'COLD_WAVE', 'FROST_RISK']:
+            state_alert = risk
+            break
+
+    # FINAL CALCULATIONS
+    water_needed = area * water_factor * water_multiplier
+    urea_needed = area * BASE_UREA_FACTOR
+    seeds_needed = area * BASE_SEEDS_FACTOR
+    if climate_zone:
+        water_needed, urea_needed = apply_location_adjustment(water_needed, urea_needed, climate_zone)
+
+    # Calculate percentage change
+    if water_multiplier == 0:
+        water_change_percent = 0
+    else:
+        water_change_percent = abs((water_multiplier - 1) * 100)
+
+    # Efficiency score
+    if water_multiplier == 0:
+        efficiency_score = 98
+    elif water_multiplier < 1:
+        efficiency_score = 95
+    elif water_multiplier > 1.2:
+        efficiency_score = 75
+    else:
+        efficiency_score = 88
+
+    return {
+        'season': season,
+        'water_needed': water_needed,
+        'urea_needed': urea_needed,
+        'seeds_needed': seeds_needed,
+        'water_multiplier': water_multiplier,
+        'water_change_percent': water_change_percent,
+        'water_saved': water_saved,
+        'efficiency_score': efficiency_score,
+        'weather_alerts': weather_alerts,
+        'irrigation_advice': irrigation_advice,
+        'irrigation_advice_hi': irrigation_advice_hi,
+        'state_alert': state_alert,
+    }
+
+
+def weather_for_date(weather_data, forecast_data, target_date):
+    """
+    Planner weather inputs for a given day: the forecast entry for that
+    date when available, otherwise the current reading
+    """
+    for day in forecast_data or []:
+        if day.get('date') == target_date.isoformat():
+            return {
+                'temp': day['temp_max'],
+                'humidity': day['humidity_avg'],
+                'description': day['description'],
+                'city': weather_data.get('city'),
+            }
+    return weather_data
@@ -0,0 +1,119 @@
+"""
+API Rate Limiting
+Sliding-window counters per endpoint, per user and per client IP. A window's
+count is blended with the previous window's, weighted by how much of it
+still overlaps:
+    estimate = previous * (1 - elapsed / window) + current
+Requests over settings.RATE_LIMITS get 429 with a Retry-After header.
+Counters live in a small SQLite file of their own (settings.RATE_LIMIT_DB)
+shared by every worker; they are disposable, so it runs without fsync and
+a check costs one SELECT and one upsert.
+"""
+
+import math
+import random
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+# Share of allowed requests that also delete expired counters
+PURGE_PROBABILITY = 0.001
+
+_local = threading.local()
+
+
+def counter_db():
+    """Per-thread connection to the counter store"""
+    db = getattr(_local, 'db', None)
+    if db is None:
+        db = sqlite3.connect(settings.RATE_LIMIT_DB, timeout=5, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=OFF')
+        db.execute('CREATE TABLE IF NOT EXISTS counters '
+                   '(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL)')
+        _local.db = db
+    return db
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def retry_after(count, previous, elapsed, window, limit, cost=1):
+    """Seconds until the sliding estimate leaves room for `cost` more requests"""
+    room = limit - cost
+    if count <= room and previous:
+        # The previous window's share has to shrink
+        wait = window * (1 - (room - count) / previous) - elapsed
+    else:
+        # This window is full: wait for it to become the (shrinking) previous one
+        wait = window - elapsed + window * max(0.0, 1 - room / count)
+    return max(1, math.ceil(wait))
+
+
+def check_limits(scope, request, now=None, cost=1):
+    """
+    Count the request (as `cost` requests) against each limit of the scope
+    Returns 0 when allowed, else the Retry-After seconds (nothing is counted)
+    """
+    limits = settings.RATE_LIMITS.get(scope)
+    if not limits:
+        return 0
+    now = time.time() if now is None else now
+
+    subjects = []
+    if request.user.is_authenticated and 'user' in limits:
+        subjects.append((f"u{request.user.pk}", *limits['user']))
+    if 'ip' in limits:
+        subjects.append((client_ip(request), *limits['ip']))
+
+    windows = []
+    for who, limit, window in subjects:
+        current = int(now // window)
+        prefix = f"{scope}:{who}:"
+        windows.append((f"{prefix}{current}", f"{prefix}{current - 1}", now - current * window, limit, window))
+
+    db = counter_db()
+    keys = [key for entry in windows for key in entry[:2]]
+    counts = dict(db.execute(
+        f"SELECT key, count FROM counters WHERE key IN ({', '.join('?' * len(keys))})", keys
+    ))
+    for key, previous_key, elapsed, limit, window in windows:
+        count, previous = counts.get(key, 0), counts.get(previous_key, 0)
+        # A request never costs more than a whole window, or it could never pass
+        charge = min(cost, limit)
+        if previous * (1 - elapsed / window) + count + charge > limit:
+            return retry_after(count, previous, elapsed, window, limit, charge)
+
+    # Kept for two windows: one as current, one as previous
+    db.executemany(
+        "INSERT INTO counters (key, count, expires) VALUES (?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET count = count + excluded.count",
+        [(key, min(cost, limit), now + 2 * window) for key, _, _, limit, window in windows],
+    )
+    if random.random() < PURGE_PROBABILITY:
+        db.execute("DELETE FROM counters WHERE expires < ?", (now,))
+    return 0
+
+
+def rate_limit(scope, cost=None):
+    """
+    View decorator applying settings.RATE_LIMITS[scope]
+    cost(request) -> how many requests this one counts as (default 1)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            wait = check_limits(scope, request, cost=cost(request) if cost else 1)
+            if wait:
+                response = JsonResponse({"error": f"Too many requests, retry in {wait} seconds"}, status=429)
+                response['Retry-After'] = str(wait)
+                return response
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,188 @@
+"""
+What-if Scenario Evaluation
+Runs the farm planner's water / urea / alert rules for every crop under many
+weather scenarios in one numpy pass, instead of re-rendering farm_planner
+per guess. A scenario perturbs today's reading and the forecast:
+    {"name": "hot, no rain", "temp_delta": 3, "humidity_delta": -10, "rain": "fail"}
+rain: "forecast" (as forecast), "fail" (no rain today or in the forecast),
+"now" (raining today). Scenarios can also be sampled Monte Carlo style
+around the forecast. The multiplier rules mirror planner.plan_crop step by step.
+"""
+
+import numpy as np
+
+from .crop_weather_rules import get_crop_rules
+from .planner import BASE_SEEDS_FACTOR, BASE_UREA_FACTOR, base_water_factor, is_rain_day
+from .utils import CLIMATE_UREA_FACTOR, CLIMATE_WATER_FACTOR
+from .weather_forecast import HOT_DAY_TEMP
+
+
+RAIN_MODES = ('forecast', 'fail', 'now')
+MAX_SCENARIOS = 5000
+PERCENTILES = (10, 50, 90)
+
+# Per-scenario values are returned only for short, hand-written scenario lists
+MAX_LISTED_SCENARIOS = 50
+
+# Keys accepted in a "monte_carlo" request block
+SAMPLING_OPTIONS = ('samples', 'temp_sd', 'humidity_sd', 'rain_fail_probability', 'seed')
+
+ALERTS = ('rain_today', 'rain_forecast', 'high_temperature', 'extended_heat', 'high_humidity', 'cool_weather')
+
+
+def parse_scenarios(items):
+    """
+    Explicit scenario list -> (names, temp_delta, humidity_delta, rain mode index)
+    Raises ValueError with a message for the API client
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("scenarios must be a non-empty list")
+    if len(items) > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS} scenarios per request")
+
+    names, temps, humidities, rains = [], [], [], []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Scenario {i} must be an object")
+        rain = item.get('rain', 'forecast')
+        if rain not in RAIN_MODES:
+            raise ValueError(f"Scenario {i}: rain must be one of {', '.join(RAIN_MODES)}")
+        try:
+            temps.append(float(item.get('temp_delta', 0)))
+            humidities.append(float(item.get('humidity_delta', 0)))
+        except (TypeError, ValueError):
+            raise ValueError(f"Scenario {i}: temp_delta and humidity_delta must be numbers")
+        names.append(str(item.get('name') or f"scenario {i + 1}"))
+        rains.append(RAIN_MODES.index(rain))
+
+    return names, np.array(temps), np.array(humidities), np.array(rains)
+
+
+def sample_scenarios(samples=500, temp_sd=2.0, humidity_sd=8.0, rain_fail_probability=0.2, seed=None):
+    """Monte Carlo scenarios: normal temp / humidity shifts, rain failing at random"""
+    try:
+        samples = int(samples)
+        temp_sd, humidity_sd, rain_fail_probability = float(temp_sd), float(humidity_sd), float(rain_fail_probability)
+    except (TypeError, ValueError):
+        raise ValueError("monte_carlo options must be numbers")
+    if not 1 <= samples <= MAX_SCENARIOS:
+        raise ValueError(f"samples must be between 1 and {MAX_SCENARIOS}")
+    if not 0 <= rain_fail_probability <= 1:
+        raise ValueError("rain_fail_probability must be between 0 and 1")
+
+    rng = np.random.default_rng(seed)
+    temps = rng.normal(0, temp_sd, samples)
+    humidities = rng.normal(0, humidity_sd, samples)
+    rains = np.where(rng.random(samples) < rain_fail_probability, RAIN_MODES.index('fail'), 0)
+    return None, temps, humidities, rains
+
+
+def scenario_weather(weather_data, forecast_data, temp_delta, humidity_delta, rain_mode):
+    """Planner inputs per scenario: temp, humidity, raining now, rain days in the next 3, hot streak"""
+    description = weather_data.get('description', 'clear sky').lower()
+    rain_now_today = 'rain' in description or 'drizzle' in description
+    fail = rain_mode == RAIN_MODES.index('fail')
+
+    temp = weather_data.get('temp', 25) + temp_delta
+    humidity = np.clip(weather_data.get('humidity', 65) + humidity_delta, 0, 100)
+    raining = np.where(rain_mode == RAIN_MODES.index('now'), True, rain_now_today & ~fail)
+
+    forecast_data = forecast_data or []
+    upcoming = sum(1 for day in forecast_data[:3] if is_rain_day(day))
+    rain_days = np.where(fail, 0, upcoming)
+
+    # Longest run of shifted daily maxima at or above HOT_DAY_TEMP ([scenario, day])
+    hot_streak = np.zeros(temp_delta.shape, dtype=int)
+    if len(forecast_data) >= 3:
+        maxima = np.array([day['temp_max'] for day in forecast_data], dtype=float)
+        hot = (maxima[None, :] + temp_delta[:, None]) >= HOT_DAY_TEMP
+        streak = np.zeros(temp_delta.shape, dtype=int)
+        for day in range(hot.shape[1]):
+            streak = np.where(hot[:, day], streak + 1, 0)
+            hot_streak = np.maximum(hot_streak, streak)
+
+    return temp, humidity, raining, rain_days, hot_streak, bool(forecast_data)
+
+
+def water_multipliers(temp, humidity, raining, rain_days, hot_streak, has_forecast):
+    """plan_crop's weather multiplier and alert flags, vectorized over scenarios"""
+    multiplier = np.ones(temp.shape)
+    alerts = {}
+
+    # 1. Rain today   2. Rain in 2 of the next 3 days
+    multiplier[raining] = 0.0
+    alerts['rain_today'] = raining
+    forecast_rain = ~raining & (rain_days >= 2) if has_forecast else np.zeros(temp.shape, dtype=bool)
+    multiplier[forecast_rain] = 0.7
+    alerts['rain_forecast'] = forecast_rain
+
+    # 3. High temperature   4. Extended heat
+    alerts['high_temperature'] = (temp > 35) & (multiplier > 0)
+    multiplier[alerts['high_temperature']] = np.maximum(multiplier[alerts['high_temperature']], 1.2)
+    alerts['extended_heat'] = (hot_streak >= 3) & (multiplier > 0)
+    multiplier[alerts['extended_heat']] = np.maximum(multiplier[alerts['extended_heat']], 1.3)
+
+    # 5. High humidity   6. Low temperature
+    alerts['high_humidity'] = (humidity > 80) & (multiplier > 0)
+    multiplier[alerts['high_humidity']] *= 0.9
+    alerts['cool_weather'] = (temp < 15) & (multiplier > 0)
+    multiplier[alerts['cool_weather']] *= 0.8
+
+    return multiplier, alerts
+
+
+def distribution(values, axis=-1):
+    """p10 / p50 / p90 / mean along an axis"""
+    p10, p50, p90 = np.percentile(values, PERCENTILES, axis=axis)
+    return {'p10': p10, 'p50': p50, 'p90': p90, 'mean': values.mean(axis=axis)}
+
+
+def evaluate_scenarios(crops, weather_data, forecast_data, scenarios, climate_zone=None):
+    """
+    crops: [(name, area_acres), ...]; scenarios: output of parse_scenarios / sample_scenarios
+    Water is a [crop, scenario] matrix; returns per-crop and farm distributions
+    """
+    names, temp_delta, humidity_delta, rain_mode = scenarios
+    inputs = scenario_weather(weather_data, forecast_data, temp_delta, humidity_delta, rain_mode)
+    multiplier, alerts = water_multipliers(*inputs)
+
+    zone = climate_zone if climate_zone in CLIMATE_WATER_FACTOR else 'inland'
+    areas = np.array([float(area) for _, area in crops])
+    base_water = np.array([base_water_factor(get_crop_rules(name.strip().title())) for name, _ in crops])
+
+    water = np.round(areas[:, None] * base_water[:, None] * multiplier[None, :] * CLIMATE_WATER_FACTOR[zone], 2)
+    urea = np.round(areas * BASE_UREA_FACTOR * CLIMATE_UREA_FACTOR[zone], 2)
+    seeds = areas * BASE_SEEDS_FACTOR
+
+    crop_water = {key: np.round(value, 1).tolist() for key, value in distribution(water, axis=1).items()}
+    farm_water = {key: round(float(value), 1) for key, value in distribution(water.sum(axis=0)).items()}
+
+    result = {
+        'scenario_count': len(multiplier),
+        'climate_zone': zone,
+        'crops': [
+            {
+                'crop': name,
+                'area': float(area),
+                'water_litres': {key: values[i] for key, values in crop_water.items()},
+                'urea_kg': float(urea[i]),
+                'seeds_kg': float(seeds[i]),
+            }
+            for i, (name, area) in enumerate(crops)
+        ],
+        'farm_water_litres': farm_water,
+        'alert_frequency': {alert: round(float(alerts[alert].mean()), 3) for alert in ALERTS},
+    }
+
+    if names is not None and len(names) <= MAX_LISTED_SCENARIOS:
+        farm_totals = water.sum(axis=0)
+        result['scenarios'] = [
+            {
+                'name': name,
+                'water_multiplier': round(float(multiplier[j]), 3),
+                'farm_water_litres': round(float(farm_totals[j]), 1),
+                'alerts': [alert for alert in ALERTS if alerts[alert][j]],
+            }
+            for j, name in enumerate(names)
+        ]
+    return result
@@ -6,6 +6,8 @@ No external APIs - pure rule-based logic
 
 from datetime import datetime
 
+from .advisory_catalog import Advisory
+
 
 # ========================================
 # STATE RISK MATRIX (Month-wise)
@@ -288,7 +290,7 @@ def get_current_month_risks(state_name):
 def get_state_risk_advisories(state_name):
     """
     Get detailed advisories for all risks in current month
-    Returns bilingual advisory objects
+    Returns Advisory objects (name_en / name_hi etc. formatted on access)
     """
     risk_types = get_current_month_risks(state_name)
     
@@ -299,19 +301,12 @@ def get_state_risk_advisories(state_name):
     for risk_type in risk_types:
         risk_info = RISK_ADVISORIES.get(risk_type, {})
         if risk_info:
-            advisories.append({
-                'advisory_key': risk_type.upper(),
-                'name_en': risk_info['name_en'],
-                'name_hi': risk_info['name_hi'],
-                'icon': risk_info['icon'],
-                'alert_type': risk_info['severity'],
-                'message_en': risk_info['message_en'],
-                'message_hi': risk_info['message_hi'],
-                'suggested_action_en': risk_info['action_en'],
-                'suggested_action_hi': risk_info['action_hi'],
-                'farm_impact_en': risk_info['farm_impact_en'],
-                'farm_impact_hi': risk_info['farm_impact_hi']
-            })
+            # Text (name / message / action / farm impact) comes from the advisory catalog
+            advisories.append(Advisory(
+                risk_type.upper(),
+                alert_type=risk_info['severity'],
+                icon=risk_info['icon'],
+            ))
     
     return advisories
 
@@ -0,0 +1,122 @@
+"""
+Upstream Quota Governor
+Shares the OpenWeather daily call budget between all workers through one
+UpstreamQuota row. Every upstream call takes a token from a bucket that
+refills at budget / 24h (holding at most OPENWEATHER_BURST), and counts
+against the day's budget. Lower priorities must leave a reserve of both
+for the ones above them:
+    PREFETCH  warm-up and nightly commands      may spend everything
+    USER      pages a farmer opened             leaves RESERVE[USER]
+    ADHOC     weather_api lookups               leaves RESERVE[ADHOC]
+A refused caller serves cached / archived data instead of calling upstream.
+"""
+
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import UpstreamQuota
+
+
+OPENWEATHER = 'openweather'
+
+PREFETCH, USER, ADHOC = 'prefetch', 'user', 'adhoc'
+
+# Share of the bucket and of the daily budget a priority may not touch
+RESERVE = {
+    PREFETCH: 0.0,
+    USER: 0.1,
+    ADHOC: 0.4,
+}
+
+# Compare-and-set attempts before a call is refused under contention
+MAX_ATTEMPTS = 5
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def quota_row(service, now):
+    row = UpstreamQuota.objects.filter(service=service).first()
+    if row is not None:
+        return row
+    try:
+        return UpstreamQuota.objects.create(
+            service=service, day=now.date(), tokens=settings.OPENWEATHER_BURST, refilled_at=now,
+        )
+    except IntegrityError:
+        # Another worker created it first
+        return UpstreamQuota.objects.get(service=service)
+
+
+def bucket_state(row, now):
+    """(used today, denied today, tokens now) after the day rollover and refill"""
+    budget, burst = settings.OPENWEATHER_DAILY_BUDGET, settings.OPENWEATHER_BURST
+    same_day = row.day == now.date()
+    elapsed = max(0.0, (now - row.refilled_at).total_seconds())
+    tokens = min(burst, row.tokens + elapsed * budget / SECONDS_PER_DAY)
+    return (row.used if same_day else 0), (row.denied if same_day else 0), tokens
+
+
+def spendable(priority, used, tokens):
+    """Calls a priority may still make now"""
+    reserve = RESERVE[priority]
+    return max(0, min(
+        math.floor(tokens - settings.OPENWEATHER_BURST * reserve),
+        math.floor(settings.OPENWEATHER_DAILY_BUDGET * (1 - reserve) - used),
+    ))
+
+
+def acquire_many(calls, priority=USER, service=OPENWEATHER):
+    """
+    Take up to `calls` upstream calls from the shared budget in one update
+    Returns how many were granted; the caller uses cached data for the rest
+    """
+    for _ in range(MAX_ATTEMPTS):
+        now = timezone.now()
+        row = quota_row(service, now)
+        used, denied, tokens = bucket_state(row, now)
+        granted = min(calls, spendable(priority, used, tokens))
+
+        updated = UpstreamQuota.objects.filter(pk=row.pk, version=row.version).update(
+            day=now.date(),
+            used=used + granted,
+            denied=denied + calls - granted,
+            tokens=tokens - granted,
+            refilled_at=now,
+            version=F('version') + 1,
+        )
+        if updated:
+            return granted
+    return 0
+
+
+def acquire(priority=USER, service=OPENWEATHER):
+    """True when one upstream call may go ahead (and records it)"""
+    return acquire_many(1, priority, service) == 1
+
+
+def quota_status(service=OPENWEATHER):
+    """Current consumption, for monitoring"""
+    now = timezone.now()
+    row = UpstreamQuota.objects.filter(service=service).first()
+    budget, burst = settings.OPENWEATHER_DAILY_BUDGET, settings.OPENWEATHER_BURST
+    used, denied, tokens = bucket_state(row, now) if row else (0, 0, burst)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return {
+        'service': service,
+        'day': now.date().isoformat(),
+        'budget': budget,
+        'used': used,
+        'denied': denied,
+        'remaining': max(0, budget - used),
+        'used_fraction': round(used / budget, 3) if budget else 1.0,
+        'tokens': round(tokens, 1),
+        'burst': burst,
+        'resets_in_seconds': int((midnight - now).total_seconds()),
+        'open_to': [priority for priority in RESERVE if spendable(priority, used, tokens)],
+    }
@@ -17,6 +17,7 @@ urlpatterns = [
     
     # NEW: Crop insight API for AJAX
     path('api/crop-insight/<str:crop_name>/', views.crop_insight_api, name='crop_insight_api'),
+    path('api/advisory-catalog/', views.advisory_catalog_api, name='advisory_catalog_api'),
     
     # Crop Management
     path('crop/add/', views.add_crop, name='add_crop'),
@@ -26,7 +27,17 @@ urlpatterns = [
     
     # Mandi Prices
     path('mandi/', views.mandi_view, name='mandi'),
+    path('mandi/export/', views.mandi_export, name='mandi_export'),
+    path('api/mandi/trend/', views.mandi_trend_api, name='mandi_trend_api'),
     path('farm_planner/', views.farm_planner, name='farm_planner'),
+    path('api/planner/scenarios/', views.planner_scenarios_api, name='planner_scenarios_api'),
+
+    # Regional analytics (staff only)
+    path('analytics/regional/', views.regional_analytics, name='regional_analytics'),
+    path('api/analytics/regional/', views.regional_analytics_api, name='regional_analytics_api'),
+    path('api/analytics/irrigation/', views.irrigation_report_api, name='irrigation_report_api'),
+    path('api/upstream-quota/', views.upstream_quota_api, name='upstream_quota_api'),
+    path('api/live-alerts/', views.live_alerts, name='live_alerts'),
 
     path('debug-info/', views.debug_view, name='debug_info'),
 ]
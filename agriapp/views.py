@@ -1,22 +1,62 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import etag, require_POST
 import requests
+import csv
+import hashlib
+import json
+import re
+import time
+from itertools import islice
+from asgiref.sync import sync_to_async
+from datetime import date
 from django.conf import settings
 from .forms import CropForm
-from .models import Crop, UserProfile
+from .models import Crop, UserProfile, IrrigationDemandReport
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.cache import cache
 from django.contrib import messages
 from django.shortcuts import get_object_or_404
 from difflib import get_close_matches
+from concurrent.futures import ThreadPoolExecutor
 
 # NEW IMPORTS - Step 2-4
-from .crop_weather_rules import get_crop_rules, get_season_rules, CROP_KNOWLEDGE_BASE
+from .crop_weather_rules import get_crop_rules, get_season_rules
 from .city_state_map import get_state_from_city
-from .weather_forecast import get_7day_forecast, analyze_forecast_unpredictability, get_forecast_summary_en, get_forecast_summary_hi
+from .weather_forecast import get_7day_forecast, start_forecast, analyze_forecast_unpredictability, get_forecast_summary_en, get_forecast_summary_hi
 from .state_risks import get_state_risk_advisories, get_risk_summary_en, get_risk_summary_hi
-from .utils import generate_daily_farm_insights, generate_farm_summary
+from .utils import generate_daily_farm_insights, generate_farm_summary, CLIMATE_WATER_FACTOR
+from .daily_advisories import weather_bucket, load_daily_advisory
+from .mandi_store import (MANDI_RESOURCE_URL, MANDI_DISPLAY_FIELDS, store_mandi_records, is_local_data_fresh,
+                          search_local_mandi, filter_mandi_prices)
+from .mandi_rollups import get_price_trend
+from .analytics import get_regional_summary
+from .planner import plan_crop
+from .advisory_catalog import Advisory, get_language, localize
+from .live_alerts import single_event
+from .geocoding import get_coordinates, learn_coordinates
+from .climate_zones import climate_zone_for_place
+from .irrigation_sim import simulate_irrigation
+from .rate_limits import rate_limit
+from .scenarios import SAMPLING_OPTIONS, evaluate_scenarios, parse_scenarios, sample_scenarios
+from .upstream_quota import ADHOC, USER, quota_status, acquire as acquire_quota, acquire_many as acquire_quota_many
+from .weather_archive import anomaly_level, fallback_weather, record_forecast, record_observation, weather_anomaly
+from .wire_format import (CATALOG_MAX_AGE, catalog_payload, catalog_version, compact_advisories, compact_response,
+                          get_format)
+
+# Forecast requests issued alongside the current-weather call, and
+# weather_api cache misses (threads start lazily)
+WEATHER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='weather')
+
+# Cities accepted by one weather_api request (?city=A,B,C)
+MAX_API_CITIES = 50
 
 # Add this RIGHT AFTER THE IMPORTS at the top of views.py
 
@@ -25,6 +65,11 @@ def get_user_location(request):
     Returns (city, state) for the logged-in user
     Falls back safely if profile is missing
     """
+    # Lazily loaded, request-scoped context from UserLocationMiddleware
+    location = getattr(request, 'location', None)
+    if location is not None:
+        return location.city, location.state
+    
     if not request.user.is_authenticated:
         return "Delhi", "Delhi"
     
@@ -103,9 +148,12 @@ def logout_view(request):
 def dashboard(request):
     current_city, current_state = get_user_location(request)
     
-    # Store in session for other views
-    request.session['user_city'] = current_city
-    request.session['user_state'] = current_state
+    # Store in session for other views - only when changed, so that a
+    # plain page view does not force a session save
+    if request.session.get('user_city') != current_city:
+        request.session['user_city'] = current_city
+    if request.session.get('user_state') != current_state:
+        request.session['user_state'] = current_state
     
     weather_data = get_weather_data(current_city)
     user_crops = Crop.objects.filter(user=request.user).order_by('-created_at')
@@ -129,6 +177,7 @@ def dashboard(request):
         'farm_summary': farm_summary,
         'user_city': current_city,  # ADD THIS
         'user_state': current_state,  # ADD THIS
+        'lang': get_language(request),  # language of the live alerts stream
     }
     return render(request, "dashboard.html", context)
 
@@ -145,25 +194,24 @@ def weather_view(request):
     state = request.GET.get('state') or profile_state
 
     
-    # Get current weather
-    weather_data = get_weather_data(city)
-    user_crops = Crop.objects.filter(user=request.user)
+    # Get current weather and 7-day forecast
+    weather_data, daily_forecasts = get_weather_and_forecast(city)
+    climate_anomaly = weather_anomaly(city, weather_data)
+    user_crops = list(Crop.objects.filter(user=request.user).order_by('id'))
     
     
-    # Get 7-day forecast and analysis
+    # 7-day forecast analysis
     forecast_data = None
     forecast_analysis = None
     forecast_summary_en = None
     forecast_summary_hi = None
     
-    if weather_data.get('lat') and weather_data.get('lon'):
-        daily_forecasts = get_7day_forecast(weather_data['lat'], weather_data['lon'])
-        if daily_forecasts:
-            forecast_data = daily_forecasts
-            forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
-            if forecast_analysis:
-                forecast_summary_en = get_forecast_summary_en(forecast_analysis)
-                forecast_summary_hi = get_forecast_summary_hi(forecast_analysis)
+    if daily_forecasts:
+        forecast_data = daily_forecasts
+        forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
+        if forecast_analysis:
+            forecast_summary_en = get_forecast_summary_en(forecast_analysis)
+            forecast_summary_hi = get_forecast_summary_hi(forecast_analysis)
     
     # Get state-based risk advisories
     state_risks = []
@@ -175,17 +223,26 @@ def weather_view(request):
         state_risk_summary_en = get_risk_summary_en(state)
         state_risk_summary_hi = get_risk_summary_hi(state)
     
-    # Get crop insights (existing logic)
-    all_crop_insights = []
-    for crop in user_crops:
-        insights = get_crop_weather_insights(crop.name, weather_data, forecast_analysis)
-        all_crop_insights.append({
-            'crop': crop,
-            'insights': insights
-        })
+    # Reuse precomputed advisories when they were built from the same inputs
+    stored = load_daily_advisory(
+        request.user, weather_data['city'], user_crops,
+        weather_bucket(weather_data, forecast_analysis, climate_anomaly)
+    )
     
-    # Generate daily insights (existing logic)
-    daily_insights = generate_daily_farm_insights(all_crop_insights, weather_data)
+    if stored:
+        all_crop_insights, daily_insights = stored
+    else:
+        # Get crop insights (existing logic)
+        all_crop_insights = []
+        for crop in user_crops:
+            insights = get_crop_weather_insights(crop.name, weather_data, forecast_analysis, climate_anomaly)
+            all_crop_insights.append({
+                'crop': crop,
+                'insights': insights
+            })
+        
+        # Generate daily insights (existing logic)
+        daily_insights = generate_daily_farm_insights(all_crop_insights, weather_data)
     
     context = {
         "city": weather_data['city'],
@@ -194,6 +251,7 @@ def weather_view(request):
         "humidity": weather_data['humidity'],
         "description": weather_data['description'],
         "weather": weather_data,
+        "climate_anomaly": climate_anomaly,
         
         # 7-day forecast data
         "forecast_data": forecast_data,
@@ -217,7 +275,15 @@ def weather_view(request):
 # WEATHER API HELPER (ENHANCED)
 # ========================================
 
-def get_weather_data(city="Delhi"):
+def weather_cache_key(city):
+    return f"weather:{city.strip().lower()}"
+
+
+def request_weather(city):
+    """
+    (reading, exact temperature, not found) from upstream; no reading on any failure
+    Network only, so it can run in WEATHER_POOL
+    """
     api_key = settings.OPENWEATHER_API_KEY
     url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
     
@@ -225,43 +291,227 @@ def get_weather_data(city="Delhi"):
         response = requests.get(url, timeout=5)
         data = response.json()
         if response.status_code != 200:
-            raise Exception("City not found")
+            return None, None, response.status_code == 404
         
-        return {
+        weather = {
             'temp': round(data['main']['temp']),
             'humidity': data['main']['humidity'],
             'description': data['weather'][0]['description'],
             'city': city.title(),
             'lat': data['coord']['lat'],  # NEW - for forecast API
-            'lon': data['coord']['lon']   # NEW - for forecast API
-        }
-    except:
-        return {
-            'temp': 25,
-            'humidity': 60,
-            'description': 'clear sky',
-            'city': city.title(),
-            'lat': None,
-            'lon': None
+            'lon': data['coord']['lon'],  # NEW - for forecast API
+            'fetched_at': int(time.time()),
         }
+        return weather, data['main']['temp'], False
+    except Exception as e:
+        # The message would include the request URL (and API key)
+        print(f"Weather fetch error for {city}: {type(e).__name__}")
+        return None, None, False
+
+
+def store_weather(city, weather, exact_temp):
+    """Cache a fresh reading (and keep it as the stale copy), learn its coordinates and archive it"""
+    # Only real readings are cached; fallbacks are retried next time
+    cache_key = weather_cache_key(city)
+    cache.set(cache_key, weather, settings.WEATHER_CACHE_SECONDS)
+    cache.set(f"stale-{cache_key}", weather, settings.WEATHER_STALE_SECONDS)
+    learn_coordinates(city, weather['lat'], weather['lon'])
+    record_observation(city, dict(weather, temp=exact_temp))
+
+
+def remember_missing(cities):
+    """Unknown cities are not asked upstream again for a while (each ask costs quota)"""
+    cache.set_many({f"missing-{weather_cache_key(city)}": True for city in cities},
+                   settings.WEATHER_NOT_FOUND_SECONDS)
+
+
+def fetch_weather(city, priority=USER):
+    """Fresh reading within the upstream quota; None when refused or not found"""
+    if not acquire_quota(priority):
+        return None
+    weather, exact_temp, not_found = request_weather(city)
+    if weather is not None:
+        store_weather(city, weather, exact_temp)
+    elif not_found:
+        remember_missing([city])
+    return weather
+
+
+def get_weather_data(city="Delhi", priority=USER):
+    cache_key = weather_cache_key(city)
+    cached = cache.get_many([cache_key, f"missing-{cache_key}"])
+    if cache_key in cached:
+        return cached[cache_key]
+
+    weather = None if f"missing-{cache_key}" in cached else fetch_weather(city, priority)
+    if weather is not None:
+        return weather
+
+    # Last good reading, else an estimate
+    stale = cache.get(f"stale-{cache_key}")
+    if stale is not None:
+        return stale
+    return estimate_weather(city)
+
+
+def estimate_weather(city):
+    """The earlier forecast for today or the city's normal for this week, else a fixed default"""
+    try:
+        estimate = fallback_weather(city)
+        if estimate:
+            lat, lon = get_coordinates(city) or (None, None)
+            return dict(estimate, city=city.title(), lat=lat, lon=lon)
+    except Exception as e:
+        print(f"Weather fallback error: {e}")
+    return {
+        'temp': 25,
+        'humidity': 60,
+        'description': 'clear sky',
+        'city': city.title(),
+        'lat': None,
+        'lon': None
+    }
+
+
+def get_weather_readings(cities, priority=ADHOC, pool=WEATHER_POOL):
+    """
+    ({city: reading or None}, cities refused by the quota) for many cities
+    One cache round trip for all of them; misses are fetched concurrently in
+    `pool` and fall back to the last good reading (no estimates). Cities
+    upstream recently did not know are not asked again
+    """
+    keys = {city: weather_cache_key(city) for city in cities}
+    cached = cache.get_many([*keys.values(), *(f"missing-{key}" for key in keys.values())])
+    readings = {city: cached.get(key) for city, key in keys.items()}
+
+    misses = [city for city, key in keys.items() if readings[city] is None and f"missing-{key}" not in cached]
+    # Quota and database writes stay on this thread; only the HTTP calls run in the pool
+    granted = acquire_quota_many(len(misses), priority) if misses else 0
+    fetches = {city: pool.submit(request_weather, city) for city in misses[:granted]}
+    not_found = []
+    for city, future in fetches.items():
+        weather, exact_temp, missing = future.result()
+        if weather is not None:
+            store_weather(city, weather, exact_temp)
+        elif missing:
+            not_found.append(city)
+        readings[city] = weather
+    if not_found:
+        remember_missing(not_found)
+
+    failed = [city for city in misses if readings[city] is None]
+    if failed:
+        stale = cache.get_many([f"stale-{keys[city]}" for city in failed])
+        for city in failed:
+            readings[city] = stale.get(f"stale-{keys[city]}")
+    refused = {city for city in misses[granted:] if readings[city] is None}
+    return readings, refused
+
+
+def get_weather_and_forecast(city="Delhi", priority=USER):
+    """
+    (weather_data, daily_forecasts) for a city
+    When the city's coordinates are known locally the current-weather and
+    forecast requests run concurrently instead of one after the other
+    """
+    coords = get_coordinates(city)
+    if coords is None:
+        weather_data = get_weather_data(city, priority)
+        if weather_data.get('lat') and weather_data.get('lon'):
+            daily_forecasts = get_7day_forecast(weather_data['lat'], weather_data['lon'], priority)
+            record_forecast(city, daily_forecasts)
+            return weather_data, daily_forecasts
+        return weather_data, None
+
+    # Only the forecast's HTTP call runs in the pool; quota and cache stay on this thread
+    forecast = start_forecast(*coords, WEATHER_POOL, priority)
+    weather_data = get_weather_data(city, priority)
+    daily_forecasts = forecast()
+    record_forecast(city, daily_forecasts)
+    return weather_data, daily_forecasts
 
 # ========================================
 # OTHER VIEWS (UNCHANGED)
 # =======================================
 
+def requested_cities(request):
+    """Distinct names from ?city=A,B,C in request order"""
+    names, seen = [], set()
+    for name in request.GET.get('city', '').split(','):
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
 @login_required
+# Every city counts against the limit, so a long list is not one cheap request
+@rate_limit('weather_api', cost=lambda request: max(1, len(requested_cities(request))))
 def weather_api(request):
-    city = request.GET.get('city')
-    api_key = settings.OPENWEATHER_API_KEY
-    if not city: return JsonResponse({"error": "City required"})
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-    response = requests.get(url)
-    data = response.json()
-    if response.status_code != 200: return JsonResponse({"error": "City not found"})
-    return JsonResponse({
-        "city": city, "temp": data["main"]["temp"],
-        "humidity": data["main"]["humidity"], "description": data["weather"][0]["description"],
-    })
+    """
+    Current weather for ?city=Kanpur or ?city=Kanpur,Lucknow,Patna
+    Readings come from the shared cache; misses are fetched concurrently.
+    Answers conditional GETs (ETag / Last-Modified) with 304
+    """
+    names = requested_cities(request)
+    if not names: return JsonResponse({"error": "City required"})
+    if len(names) > MAX_API_CITIES:
+        return JsonResponse({"error": f"At most {MAX_API_CITIES} cities per request"}, status=400)
+
+    readings, refused = get_weather_readings(names)
+    fmt = get_format(request)
+    fetched = [reading.get('fetched_at', 0) for reading in readings.values() if reading]
+
+    etag_source = '|'.join(f"{name}:{(reading or {}).get('fetched_at')}" for name, reading in readings.items())
+    etag = '"%s"' % hashlib.md5(f"{etag_source}|{fmt}".encode('utf-8')).hexdigest()
+    last_modified = max(fetched) if fetched else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = weather_api_response(names, readings, refused, fmt)
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    # Clients may keep the body but must revalidate before reusing it
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def weather_api_response(names, readings, refused, fmt):
+    now = time.time()
+
+    def error(name):
+        # Ad-hoc lookups are the first to stop when the daily budget runs low
+        return "Weather lookups are paused, try again later" if name in refused else "City not found"
+
+    def result(reading):
+        fetched_at = reading.get('fetched_at')
+        return {
+            "temp": reading["temp"], "humidity": reading["humidity"], "description": reading["description"],
+            "fetched_at": http_date(fetched_at) if fetched_at else None,
+            "stale": bool(fetched_at) and now - fetched_at > settings.WEATHER_CACHE_SECONDS,
+        }
+
+    if len(names) == 1:
+        reading = readings[names[0]]
+        if reading is None:
+            return JsonResponse({"error": error(names[0])}, status=503 if names[0] in refused else 200)
+        if fmt != 'json':
+            # [temp, humidity, description, fetched_at]; the client already knows the city
+            return compact_response([reading["temp"], reading["humidity"], reading["description"],
+                                     reading.get('fetched_at')], fmt)
+        return JsonResponse(dict(result(reading), city=names[0]))
+
+    if fmt != 'json':
+        return compact_response({
+            name: [reading["temp"], reading["humidity"], reading["description"], reading.get('fetched_at')]
+            if reading else None
+            for name, reading in readings.items()
+        }, fmt)
+    return JsonResponse({"cities": {
+        name: result(reading) if reading else {"error": error(name)}
+        for name, reading in readings.items()
+    }})
 
 
 @login_required
@@ -329,21 +579,13 @@ def smart_match(user_input, reference_list):
     return matches[0] if matches else user_input
 
 
-@login_required
-def mandi_view(request):
-    profile_city, profile_state = get_user_location(request)
-    state_input = request.GET.get("state") or profile_state or "Delhi"
-    comm_input = request.GET.get("commodity", "")
-    dist_input = request.GET.get("district") or profile_city or "Delhi"
-    
-    final_state = smart_match(state_input, VALID_STATES)
-    final_comm = smart_match(comm_input, VALID_COMMODITIES)
-    final_dist = dist_input.strip().title() if dist_input else None
+def fetch_live_mandi(final_state, final_comm, final_dist):
+    """Query data.gov.in with the district -> state fallbacks"""
     params = {"api-key": settings.MANDI_API_KEY, "format": "json", "limit": 50}
     if final_state: params["filters[state.keyword]"] = final_state
     if final_comm: params["filters[commodity]"] = final_comm
     if final_dist: params["filters[district]"] = final_dist
-    mandi_data = []; msg = ""; url = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+    mandi_data = []; msg = ""; url = MANDI_RESOURCE_URL
     try:
         response = requests.get(url, params=params); res_json = response.json(); mandi_data = res_json.get("records", [])
         if not mandi_data and final_dist:
@@ -355,6 +597,38 @@ def mandi_view(request):
             params = {"api-key": settings.MANDI_API_KEY, "format": "json", "limit": 20, "filters[state.keyword]": final_state}; res_state = requests.get(url, params=params); mandi_data = res_state.json().get("records", [])
             msg = f"'{final_comm}' ka rate abhi update nahi hua hai. Aapke state ki dusri fasalon ka rate dekhein."
     except Exception as e: msg = "Network me kuch problem hai, kripya thodi der baad koshish karein."
+    
+    # Keep every fetched record in the local price history
+    try:
+        store_mandi_records(mandi_data)
+    except Exception as e:
+        print(f"Mandi store error: {e}")
+    return mandi_data, msg
+
+
+@login_required
+def mandi_view(request):
+    profile_city, profile_state = get_user_location(request)
+    state_input = request.GET.get("state") or profile_state or "Delhi"
+    comm_input = request.GET.get("commodity", "")
+    dist_input = request.GET.get("district") or profile_city or "Delhi"
+    
+    final_state = smart_match(state_input, VALID_STATES)
+    final_comm = smart_match(comm_input, VALID_COMMODITIES)
+    final_dist = dist_input.strip().title() if dist_input else None
+    sort = request.GET.get("sort", "date")
+    page_obj = None
+    
+    # Serve from the local price store unless the state's data is missing or stale
+    if is_local_data_fresh(final_state):
+        page_obj, msg = search_local_mandi(final_state, final_comm, final_dist, sort, request.GET.get("page"))
+        mandi_data = page_obj.object_list
+    else:
+        mandi_data, msg = fetch_live_mandi(final_state, final_comm, final_dist)
+    
+    # Price trend panel (reads only the precomputed rollups)
+    price_trend = get_commodity_trend(final_comm, final_state, final_dist) if final_comm else None
+    
     return render(request, "mandi.html", {
         "mandi_data": mandi_data,
         "message": msg,
@@ -365,8 +639,92 @@ def mandi_view(request):
         },
         "valid_states": VALID_STATES,
         "valid_commodities": VALID_COMMODITIES,
+        "page_obj": page_obj,
+        "sort": sort,
+        "price_trend": price_trend,
     })
 
+
+def get_commodity_trend(commodity, state, district=None, period='week'):
+    """District trend when rollups exist for it, otherwise the state-wide trend"""
+    if district:
+        trend = get_price_trend(commodity, state, district, period)
+        if trend['series']:
+            return trend
+    return get_price_trend(commodity, state, None, period)
+
+
+class EchoBuffer:
+    """File-like object whose write() just returns the line for csv.writer"""
+    def write(self, value):
+        return value
+
+
+# Lines per hop to the sync thread when streaming an export under ASGI
+EXPORT_ASYNC_LINES = 500
+
+
+def iter_mandi_export(queryset, export_format):
+    # The CSV header goes out before the query runs, so the client sees the first byte immediately
+    if export_format == "jsonl":
+        for row in queryset.values(*MANDI_DISPLAY_FIELDS).iterator(chunk_size=2000):
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+    else:
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(MANDI_DISPLAY_FIELDS)
+        for row in queryset.values_list(*MANDI_DISPLAY_FIELDS).iterator(chunk_size=2000):
+            yield writer.writerow(row)
+
+
+async def aiter_mandi_export(queryset, export_format):
+    """
+    iter_mandi_export for ASGI, where Django would drain a sync iterator into
+    memory before sending it. Every hop runs on the same sync thread, which
+    owns the DB cursor.
+    """
+    lines = iter_mandi_export(queryset, export_format)
+    take = sync_to_async(lambda: "".join(islice(lines, EXPORT_ASYNC_LINES)))
+    try:
+        while chunk := await take():
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
+
+
+@login_required
+def mandi_export(request):
+    """Stream every local mandi row matching the filters as CSV or JSONL"""
+    profile_city, profile_state = get_user_location(request)
+    final_state = smart_match(request.GET.get("state") or profile_state, VALID_STATES)
+    final_comm = smart_match(request.GET.get("commodity", ""), VALID_COMMODITIES)
+    dist_input = request.GET.get("district")
+    final_dist = dist_input.strip().title() if dist_input else None
+    export_format = "jsonl" if request.GET.get("format") == "jsonl" else "csv"
+    
+    queryset = filter_mandi_prices(final_state, final_comm, final_dist, request.GET.get("sort", "date"))
+    
+    content_type = "application/x-ndjson" if export_format == "jsonl" else "text/csv"
+    stream = aiter_mandi_export if isinstance(request, ASGIRequest) else iter_mandi_export
+    response = StreamingHttpResponse(stream(queryset, export_format), content_type=f"{content_type}; charset=utf-8")
+    # smart_match hands back unmatched input as-is, so keep only safe characters
+    parts = (re.sub(r"[^\w-]", "", part.replace(" ", "-"), flags=re.ASCII) for part in [final_state, final_dist, final_comm] if part)
+    filename = "_".join(part for part in parts if part)
+    response["Content-Disposition"] = f'attachment; filename="mandi_{filename}.{export_format}"'
+    return response
+
+
+@login_required
+def mandi_trend_api(request):
+    """Price trend for a commodity from the mandi rollup tables"""
+    commodity = smart_match(request.GET.get("commodity"), VALID_COMMODITIES)
+    if not commodity: return JsonResponse({"error": "Commodity required"}, status=400)
+    profile_city, profile_state = get_user_location(request)
+    state = smart_match(request.GET.get("state") or profile_state, VALID_STATES)
+    district = request.GET.get("district")
+    district = district.strip().title() if district else None
+    period = request.GET.get("period", "week")
+    return JsonResponse(get_commodity_trend(commodity, state, district, period))
+
 def register_view(request):
     if request.method == "POST":
         username = request.POST.get("username")
@@ -408,10 +766,12 @@ def register_view(request):
 # ENHANCED CROP WEATHER INTELLIGENCE (STEP 4)
 # ========================================
 
-def get_crop_weather_insights(crop_name, weather_data, forecast_analysis=None):
+def get_crop_weather_insights(crop_name, weather_data, forecast_analysis=None, anomaly=None):
     """
-    Generate bilingual weather advisories for a specific crop
-    Enhanced with 7-day forecast analysis
+    Generate weather advisories for a specific crop
+    Enhanced with 7-day forecast analysis and the city's normal for the week
+    (anomaly from weather_archive.weather_anomaly)
+    Text is formatted lazily from the advisory catalog (en / hi)
     """
     
     # CORRECT CODE STARTS HERE:
@@ -428,6 +788,7 @@ def get_crop_weather_insights(crop_name, weather_data, forecast_analysis=None):
         ideal_max = crop_rules.get('ideal_temp_max', 30)
         heat_threshold = crop_rules.get('heat_stress_threshold', 35)
         water_need = crop_rules.get('water_requirement', 'MEDIUM')
+        params = {'crop': crop_name, 'crop_hi': crop_name_hi}
         
         # === TEMPERATURE ANALYSIS (ENHANCED) ===
         
@@ -435,171 +796,58 @@ def get_crop_weather_insights(crop_name, weather_data, forecast_analysis=None):
         extended_heat = False
         if forecast_analysis and forecast_analysis.get('max_consecutive_hot', 0) >= 3:
             extended_heat = True
-            insights.append({
-                'advisory_key': 'EXTENDED_HEAT_STRESS',
-                'message_en': f'⚠️ Extended heat period ({forecast_analysis["max_consecutive_hot"]} days) will stress {crop_name}',
-                'message_hi': f'⚠️ लंबी गर्मी की अवधि ({forecast_analysis["max_consecutive_hot"]} दिन) {crop_name_hi} को तनाव देगी',
-                'alert_type': 'danger',
-                'suggested_action_en': f'Plan increased irrigation for next {forecast_analysis["max_consecutive_hot"]} days. Consider mulching to retain moisture.',
-                'suggested_action_hi': f'अगले {forecast_analysis["max_consecutive_hot"]} दिनों के लिए बढ़ी हुई सिंचाई की योजना बनाएं। नमी बनाए रखने के लिए मल्चिंग पर विचार करें।',
-                'icon': '🔥'
-            })
+            insights.append(Advisory('EXTENDED_HEAT_STRESS', dict(params, days=forecast_analysis['max_consecutive_hot'])))
         
         # Current day temperature stress
         if temp >= heat_threshold and not extended_heat:
-            insights.append({
-                'advisory_key': 'HEAT_STRESS_CRITICAL',
-                'message_en': f'⚠️ Critical heat stress for {crop_name}',
-                'message_hi': f'⚠️ {crop_name_hi} के लिए गंभीर गर्मी का तनाव',
-                'alert_type': 'danger',
-                'suggested_action_en': 'Irrigate early morning (before 7 AM). Provide shade if possible.',
-                'suggested_action_hi': 'सुबह जल्दी (7 बजे से पहले) सिंचाई करें। संभव हो तो छाया दें।',
-                'icon': '🔥'
-            })
+            insights.append(Advisory('HEAT_STRESS_CRITICAL', params))
         elif temp > ideal_max:
-            insights.append({
-                'advisory_key': 'HEAT_STRESS_MODERATE',
-                'message_en': f'High temperature may stress {crop_name}',
-                'message_hi': f'अधिक तापमान {crop_name_hi} को नुकसान पहुँचा सकता है',
-                'alert_type': 'warning',
-                'suggested_action_en': 'Avoid irrigation during afternoon. Water in evening or early morning.',
-                'suggested_action_hi': 'दोपहर में सिंचाई न करें। शाम या सुबह पानी दें।',
-                'icon': '🌡️'
-            })
+            insights.append(Advisory('HEAT_STRESS_MODERATE', params))
         elif temp < ideal_min:
-            insights.append({
-                'advisory_key': 'COLD_STRESS',
-                'message_en': f'Temperature below ideal for {crop_name}',
-                'message_hi': f'{crop_name_hi} के लिए तापमान कम है',
-                'alert_type': 'info',
-                'suggested_action_en': 'Growth may slow down. No immediate action needed.',
-                'suggested_action_hi': 'विकास धीमा हो सकता है। तुरंत कोई कार्रवाई जरूरी नहीं।',
-                'icon': '❄️'
-            })
+            insights.append(Advisory('COLD_STRESS', params))
         else:
-            insights.append({
-                'advisory_key': 'TEMP_FAVORABLE',
-                'message_en': f'Favorable temperature for {crop_name}',
-                'message_hi': f'{crop_name_hi} के लिए अनुकूल तापमान',
-                'alert_type': 'success',
-                'suggested_action_en': 'Continue normal farming practices.',
-                'suggested_action_hi': 'सामान्य खेती जारी रखें।',
-                'icon': '✅'
-            })
+            insights.append(Advisory('TEMP_FAVORABLE', params))
+        
+        # Unusually warm / cool for the week, even when within the crop's range
+        level = anomaly_level(anomaly)
+        if level:
+            anomaly_params = dict(params, delta=abs(anomaly['temp']), normal=anomaly['normal']['temp_mean'])
+            insights.append(Advisory('TEMP_ABOVE_NORMAL' if level == 'above' else 'TEMP_BELOW_NORMAL', anomaly_params))
         
         # === UNPREDICTABILITY WARNING ===
         
         if forecast_analysis and forecast_analysis.get('stability_score') == 'HIGHLY UNSTABLE':
-            insights.append({
-                'advisory_key': 'WEATHER_UNPREDICTABLE',
-                'message_en': f'Unstable weather pattern this week - risky for {crop_name}',
-                'message_hi': f'इस सप्ताह अस्थिर मौसम पैटर्न - {crop_name_hi} के लिए जोखिम भरा',
-                'alert_type': 'warning',
-                'suggested_action_en': 'Delay major farming decisions (spraying, fertilizing). Monitor daily weather.',
-                'suggested_action_hi': 'प्रमुख खेती के निर्णयों (छिड़काव, उर्वरक) में देरी करें। दैनिक मौसम की निगरानी करें।',
-                'icon': '⚠️'
-            })
+            insights.append(Advisory('WEATHER_UNPREDICTABLE', params))
         
         # === IRRIGATION ANALYSIS ===
         
         if 'rain' in description or 'drizzle' in description:
-            insights.append({
-                'advisory_key': 'RAIN_DETECTED',
-                'message_en': 'Rain expected or ongoing',
-                'message_hi': 'बारिश होने वाली है या हो रही है',
-                'alert_type': 'info',
-                'suggested_action_en': 'Skip irrigation today. Save water and costs.',
-                'suggested_action_hi': 'आज सिंचाई छोड़ दें। पानी और खर्च बचाएं।',
-                'icon': '🌧️'
-            })
+            insights.append(Advisory('RAIN_DETECTED', params))
         else:
             if water_need == 'HIGH' and humidity < 60:
-                insights.append({
-                    'advisory_key': 'IRRIGATION_HIGH_NEED',
-                    'message_en': f'{crop_name} needs regular watering',
-                    'message_hi': f'{crop_name_hi} को नियमित पानी चाहिए',
-                    'alert_type': 'warning',
-                    'suggested_action_en': 'Irrigate daily. Check soil moisture regularly.',
-                    'suggested_action_hi': 'रोज़ाना सिंचाई करें। मिट्टी की नमी जांचें।',
-                    'icon': '💧'
-                })
+                insights.append(Advisory('IRRIGATION_HIGH_NEED', params))
             elif water_need == 'MEDIUM' and humidity < 50 and temp > 30:
-                insights.append({
-                    'advisory_key': 'IRRIGATION_MEDIUM_NEED',
-                    'message_en': 'Moderate irrigation required',
-                    'message_hi': 'मध्यम सिंचाई आवश्यक है',
-                    'alert_type': 'info',
-                    'suggested_action_en': 'Irrigate every 2-3 days based on soil condition.',
-                    'suggested_action_hi': 'मिट्टी की स्थिति के अनुसार 2-3 दिन में सिंचाई करें।',
-                    'icon': '💧'
-                })
+                insights.append(Advisory('IRRIGATION_MEDIUM_NEED', params))
             elif water_need == 'LOW' and temp > 35:
-                insights.append({
-                    'advisory_key': 'IRRIGATION_LOW_NEED',
-                    'message_en': f'{crop_name} is drought-tolerant but needs care in heat',
-                    'message_hi': f'{crop_name_hi} सूखा सहनशील है पर गर्मी में देखभाल चाहिए',
-                    'alert_type': 'info',
-                    'suggested_action_en': 'Light irrigation every 4-5 days is sufficient.',
-                    'suggested_action_hi': 'हर 4-5 दिन में हल्की सिंचाई काफी है।',
-                    'icon': '💧'
-                })
+                insights.append(Advisory('IRRIGATION_LOW_NEED', params))
         
         # === DISEASE RISK ===
         
         if humidity > 80:
-            insights.append({
-                'advisory_key': 'FUNGAL_RISK',
-                'message_en': 'High humidity increases fungal disease risk',
-                'message_hi': 'अधिक नमी से फफूंद रोग का खतरा बढ़ता है',
-                'alert_type': 'warning',
-                'suggested_action_en': 'Monitor for leaf spots. Ensure good air circulation.',
-                'suggested_action_hi': 'पत्तियों पर धब्बे देखें। हवा का संचार अच्छा रखें।',
-                'icon': '🍄'
-            })
+            insights.append(Advisory('FUNGAL_RISK', params))
     
     else:
         # Fallback for unknown crops
+        params = {'crop': crop_name}
         if temp > 35:
-            insights.append({
-                'advisory_key': 'GENERIC_HEAT',
-                'message_en': f'High heat may affect {crop_name}',
-                'message_hi': f'अधिक गर्मी {crop_name} को प्रभावित कर सकती है',
-                'alert_type': 'warning',
-                'suggested_action_en': 'Increase watering frequency. Avoid midday activities.',
-                'suggested_action_hi': 'पानी देने की आवृत्ति बढ़ाएं। दोपहर में काम न करें।',
-                'icon': '🔥'
-            })
+            insights.append(Advisory('GENERIC_HEAT', params))
         elif temp < 15:
-            insights.append({
-                'advisory_key': 'GENERIC_COLD',
-                'message_en': f'Cool weather for {crop_name}',
-                'message_hi': f'{crop_name} के लिए ठंडा मौसम',
-                'alert_type': 'info',
-                'suggested_action_en': 'Monitor growth. Protect from frost if needed.',
-                'suggested_action_hi': 'विकास पर नजर रखें। जरूरत हो तो पाले से बचाएं।',
-                'icon': '❄️'
-            })
+            insights.append(Advisory('GENERIC_COLD', params))
         else:
-            insights.append({
-                'advisory_key': 'GENERIC_NORMAL',
-                'message_en': f'Weather conditions suitable for {crop_name}',
-                'message_hi': f'{crop_name} के लिए मौसम उपयुक्त है',
-                'alert_type': 'success',
-                'suggested_action_en': 'Continue regular farm operations.',
-                'suggested_action_hi': 'नियमित खेती जारी रखें।',
-                'icon': '✅'
-            })
+            insights.append(Advisory('GENERIC_NORMAL', params))
         
         if 'rain' in description:
-            insights.append({
-                'advisory_key': 'GENERIC_RAIN',
-                'message_en': 'Rain expected',
-                'message_hi': 'बारिश की संभावना',
-                'alert_type': 'info',
-                'suggested_action_en': 'Skip irrigation. Prepare drainage if heavy rain.',
-                'suggested_action_hi': 'सिंचाई छोड़ें। भारी बारिश हो तो जल निकासी तैयार रखें।',
-                'icon': '🌧️'
-            })
+            insights.append(Advisory('GENERIC_RAIN', params))
     
     return insights
 @login_required
@@ -614,10 +862,11 @@ def farm_planner(request):
         # Get current city and weather
         city, state = get_user_location(request)
         
-        # Get weather data with error handling
+        # Get weather data and 7-day forecast with error handling
         weather_data = {}
+        daily_forecasts = None
         try:
-            weather_data = get_weather_data(city)
+            weather_data, daily_forecasts = get_weather_and_forecast(city)
         except Exception as e:
             print(f"Weather API error: {e}")
             # Default weather data if API fails
@@ -628,15 +877,12 @@ def farm_planner(request):
                 'city': city
             }
         
-        # Get 7-day forecast
         forecast_data = None
         forecast_analysis = None
         try:
-            if weather_data.get('lat') and weather_data.get('lon'):
-                daily_forecasts = get_7day_forecast(weather_data['lat'], weather_data['lon'])
-                if daily_forecasts:
-                    forecast_data = daily_forecasts
-                    forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
+            if daily_forecasts:
+                forecast_data = daily_forecasts
+                forecast_analysis = analyze_forecast_unpredictability(daily_forecasts)
         except Exception as e:
             print(f"Forecast error: {e}")
         
@@ -648,174 +894,39 @@ def farm_planner(request):
         except Exception as e:
             print(f"State risks error: {e}")
         
+        # Coastal / inland / arid adjustment for the farm's location
+        climate_zone = climate_zone_for_place(city, weather_data)
+        
         planned_data = []
         total_area = 0
         total_water_saved = 0
         
         for crop in user_crops:  # ✅ FOR LOOP STARTS HERE
             try:
-                crop_name = crop.name.strip().title()
                 area = float(crop.area)
                 total_area += area
                 
-                # Get crop rules
-                crop_rules = get_crop_rules(crop_name)
-                
-                if crop_rules:
-                    season = crop_rules.get('season', 'General')
-                    water_requirement = crop_rules.get('water_requirement', 'MEDIUM')
-                    
-                    if water_requirement == 'HIGH':
-                        base_water_factor = 15000
-                    elif water_requirement == 'MEDIUM':
-                        base_water_factor = 12000
-                    else:
-                        base_water_factor = 8000
-                    
-                    base_urea_factor = 45
-                    base_seeds_factor = 40
-                else:
-                    # Fallback values
-                    season = getattr(crop, 'season', 'General')
-                    base_water_factor = 12000
-                    base_urea_factor = 45
-                    base_seeds_factor = 40
-                
-                # Weather-based adjustments
-                temp = weather_data.get('temp', 25)
-                humidity = weather_data.get('humidity', 65)
-                description = weather_data.get('description', 'clear sky').lower()
-                
-                water_multiplier = 1.0
-                weather_alerts = []
-                irrigation_advice = "Normal irrigation schedule"
-                irrigation_advice_hi = "सामान्य सिंचाई कार्यक्रम"
-                water_saved = 0
-                
-                # 1. RAIN DETECTION (current weather)
-                if 'rain' in description or 'drizzle' in description:
-                    water_multiplier = 0.0
-                    weather_alerts.append({
-                        'type': 'info',
-                        'icon': '🌧️',
-                        'message_en': 'Rain expected - Skip irrigation today',
-                        'message_hi': 'बारिश की उम्मीद - आज सिंचाई छोड़ें'
-                    })
-                    irrigation_advice = "SKIP IRRIGATION - Rain will provide water"
-                    irrigation_advice_hi = "सिंचाई छोड़ें - बारिश पानी देगी"
-                    water_saved = base_water_factor * area
-                    total_water_saved += water_saved
-                
-                # 2. FORECAST RAIN CHECK (only if no current rain)
-                elif forecast_data and water_multiplier > 0:
-                    try:
-                        upcoming_rain_days = sum(1 for day in forecast_data[:3] 
-                                               if day.get('rain_probability', 0) > 50)
-                        if upcoming_rain_days >= 2:
-                            water_multiplier = 0.7
-                            weather_alerts.append({
-                                'type': 'info',
-                                'icon': '🌦️',
-                                'message_en': f'Rain expected in next {upcoming_rain_days} days - Reduce irrigation',
-                                'message_hi': f'अगले {upcoming_rain_days} दिनों में बारिश की उम्मीद - सिंचाई कम करें'
-                            })
-                            irrigation_advice = "Light irrigation only - Rain coming soon"
-                            irrigation_advice_hi = "हल्की सिंचाई - जल्द बारिश आएगी"
-                    except Exception as e:
-                        print(f"Forecast check error: {e}")
-                
-                # 3. HIGH TEMPERATURE (only apply if not already adjusted for rain)
-                if temp > 35 and water_multiplier > 0:
-                    water_multiplier = max(water_multiplier, 1.2)
-                    weather_alerts.append({
-                        'type': 'warning',
-                        'icon': '🔥',
-                        'message_en': f'High temperature ({temp}°C) - Increase watering by 20%',
-                        'message_hi': f'उच्च तापमान ({temp}°C) - पानी 20% बढ़ाएं'
-                    })
-                    if irrigation_advice == "Normal irrigation schedule":
-                        irrigation_advice = "EXTRA watering needed - Water early morning (before 7 AM)"
-                        irrigation_advice_hi = "अतिरिक्त पानी चाहिए - सुबह जल्दी पानी दें (7 बजे से पहले)"
-                
-                # 4. EXTENDED HEAT
-                if forecast_analysis and forecast_analysis.get('max_consecutive_hot', 0) >= 3 and water_multiplier > 0:
-                    water_multiplier = max(water_multiplier, 1.3)
-                    weather_alerts.append({
-                        'type': 'danger',
-                        'icon': '🌡️',
-                        'message_en': f'Extended heat ({forecast_analysis["max_consecutive_hot"]} days) - Plan extra water',
-                        'message_hi': f'लंबी गर्मी ({forecast_analysis["max_consecutive_hot"]} दिन) - अतिरिक्त पानी की योजना बनाएं'
-                    })
-                
-                # 5. HIGH HUMIDITY (only reduce if not already at 0)
-                if humidity > 80 and water_multiplier > 0:
-                    water_multiplier *= 0.9
-                    weather_alerts.append({
-                        'type': 'info',
-                        'icon': '💧',
-                        'message_en': f'High humidity ({humidity}%) - Reduce watering slightly',
-                        'message_hi': f'अधिक नमी ({humidity}%) - पानी थोड़ा कम करें'
-                    })
-                
-                # 6. LOW TEMPERATURE (only reduce if not already at 0)
-                if temp < 15 and water_multiplier > 0:
-                    water_multiplier *= 0.8
-                    weather_alerts.append({
-                        'type': 'info',
-                        'icon': '❄️',
-                        'message_en': f'Cool weather ({temp}°C) - Less water needed',
-                        'message_hi': f'ठंडा मौसम ({temp}°C) - कम पानी चाहिए'
-                    })
-                
-                # STATE RISK ALERTS
-                state_alert = None
-                for risk in state_risks:
-                    if risk.get('advisory_key') in ['HEATWAVE_RISK', 'HEAVY_RAINFALL', 'FLOOD_RISK', 'COLD_WAVE', 'FROST_RISK']:
-                        state_alert = {
-                            'icon': risk.get('icon', '⚠️'),
-                            'name_en': risk.get('name_en', 'State Alert'),
-                            'name_hi': risk.get('name_hi', 'राज्य चेतावनी'),
-                            'farm_impact_en': risk.get('farm_impact_en', 'Potential impact on farming activities')
-                        }
-                        break
-                
-                # FINAL CALCULATIONS
-                water_needed = area * base_water_factor * water_multiplier
-                urea_needed = area * base_urea_factor
-                seeds_needed = area * base_seeds_factor
-                
-                # Calculate percentage change
-                if water_multiplier == 0:
-                    water_change_percent = 0
-                else:
-                    water_change_percent = abs((water_multiplier - 1) * 100)
-                
-                # Efficiency score
-                if water_multiplier == 0:
-                    efficiency_score = 98
-                elif water_multiplier < 1:
-                    efficiency_score = 95
-                elif water_multiplier > 1.2:
-                    efficiency_score = 75
-                else:
-                    efficiency_score = 88
+                plan = plan_crop(crop.name, area, weather_data, forecast_data, forecast_analysis,
+                                 state_risks, fallback_season=getattr(crop, 'season', 'General'),
+                                 climate_zone=climate_zone)
+                total_water_saved += plan['water_saved']
                 
                 # Add to planned data
                 planned_data.append({
                     'obj': crop,
-                    'water': f"{int(water_needed):,}",
-                    'water_raw': int(water_needed),
-                    'urea': f"{urea_needed:.1f}",
-                    'seeds': f"{seeds_needed:.1f}",
-                    'season': season,
-                    'efficiency_score': efficiency_score,
-                    'weather_alerts': weather_alerts,
-                    'irrigation_advice': irrigation_advice,
-                    'irrigation_advice_hi': irrigation_advice_hi,
-                    'water_multiplier': water_multiplier,
-                    'water_change_percent': int(water_change_percent),
-                    'water_saved': int(water_saved) if water_saved > 0 else 0,
-                    'state_alert': state_alert
+                    'water': f"{int(plan['water_needed']):,}",
+                    'water_raw': int(plan['water_needed']),
+                    'urea': f"{plan['urea_needed']:.1f}",
+                    'seeds': f"{plan['seeds_needed']:.1f}",
+                    'season': plan['season'],
+                    'efficiency_score': plan['efficiency_score'],
+                    'weather_alerts': plan['weather_alerts'],
+                    'irrigation_advice': plan['irrigation_advice'],
+                    'irrigation_advice_hi': plan['irrigation_advice_hi'],
+                    'water_multiplier': plan['water_multiplier'],
+                    'water_change_percent': int(plan['water_change_percent']),
+                    'water_saved': int(plan['water_saved']) if plan['water_saved'] > 0 else 0,
+                    'state_alert': plan['state_alert']
                 })
                 
             except Exception as e:
@@ -823,6 +934,22 @@ def farm_planner(request):
                 # continue  # ❌ REMOVE THIS LINE
                 # Just let it skip to next crop automatically
         
+        # Day-by-day irrigation schedule for every plot over the forecast window
+        schedule = None
+        try:
+            coords = get_coordinates(city) or (weather_data.get('lat'), weather_data.get('lon'))
+            description = weather_data.get('description', '').lower()
+            schedule = simulate_irrigation(
+                [(item['obj'].name, item['obj'].area) for item in planned_data], forecast_data,
+                latitude=coords[0], raining_now='rain' in description or 'drizzle' in description,
+            )
+        except Exception as e:
+            print(f"Irrigation schedule error: {e}")
+        if schedule:
+            for item, plot in zip(planned_data, schedule['plots']):
+                item['schedule'] = list(zip(schedule['dates'], plot['litres']))
+                item['schedule_total'] = plot['total_litres']
+        
         # ✅ FOR LOOP ENDS HERE - NOW CREATE CONTEXT
         context = {
             'planned_data': planned_data,
@@ -833,6 +960,10 @@ def farm_planner(request):
             'weather': weather_data,
             'total_water_saved': int(total_water_saved),
             'forecast_analysis': forecast_analysis,
+            'climate_zone': climate_zone,
+            'climate_water_factor': CLIMATE_WATER_FACTOR[climate_zone],
+            'schedule_days': len(schedule['dates']) if schedule else 0,
+            'schedule_total_litres': schedule['total_litres'] if schedule else 0,
         }
         
         return render(request, 'farm_planner.html', context)
@@ -852,10 +983,145 @@ def farm_planner(request):
             'error_message': 'Unable to load farm planner data. Please try again.'
         })
 @login_required
+@rate_limit('crop_insight_api')
 def crop_insight_api(request, crop_name):
-    """API endpoint for crop-specific weather insights"""
-    city = request.session.get('user_city', 'Delhi')
+    """
+    API endpoint for crop-specific weather insights (?lang=en|hi)
+    ?format=compact|msgpack sends advisory codes, rendered with the advisory catalog
+    """
+    city, _ = get_user_location(request)
+    lang = get_language(request)
     weather_data = get_weather_data(city)
-    insights = get_crop_weather_insights(crop_name, weather_data)
-    return JsonResponse({'crop': crop_name, 'insights': insights})
+    advisories = get_crop_weather_insights(crop_name, weather_data, anomaly=weather_anomaly(city, weather_data))
+    fmt = get_format(request)
+    if fmt != 'json':
+        return compact_response(compact_advisories(advisories), fmt)
+
+    insights = localize(advisories, lang)
+    # Raw UTF-8: escaped Devanagari is twice the size on the wire
+    return JsonResponse({'crop': crop_name, 'lang': lang, 'insights': insights},
+                        json_dumps_params={'ensure_ascii': False})
 
+
+@etag(lambda request: f"{catalog_version()}-{get_language(request)}-{get_format(request)}")
+def advisory_catalog_api(request):
+    """
+    Advisory texts for one language, indexed by compact code (?lang=en|hi)
+    Fetched once by field apps and revalidated by ETag
+    """
+    fmt = 'msgpack' if get_format(request) == 'msgpack' else 'compact'
+    response = compact_response(catalog_payload(get_language(request)), fmt)
+    patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+    return response
+
+
+@login_required
+def live_alerts(request):
+    """
+    Dashboard alert events (text/event-stream). Under ASGI, agri.asgi serves
+    this path with long-lived streams (live_alerts.LiveAlertsApp); this view
+    is the WSGI fallback: one event, then the browser reconnects
+    """
+    city, state = get_user_location(request)
+    crop_names = list(
+        Crop.objects.filter(user=request.user).order_by('-created_at').values_list('name', flat=True)[:3]
+    )
+    response = HttpResponse(single_event(city, state, crop_names, get_language(request)), content_type="text/event-stream")
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+# ========================================
+# REGIONAL ANALYTICS (STAFF)
+# ========================================
+
+@staff_member_required
+def regional_analytics(request):
+    """Acreage and water demand per crop, season and state"""
+    state = request.GET.get("state") or None
+    season = request.GET.get("season") or None
+    summary = get_regional_summary(state, season)
+    return render(request, "regional_analytics.html", {
+        "summary": summary,
+        "season_choices": Crop.SEASON_CHOICES,
+    })
+
+
+@staff_member_required
+def regional_analytics_api(request):
+    state = request.GET.get("state") or None
+    season = request.GET.get("season") or None
+    return JsonResponse(get_regional_summary(state, season))
+
+
+@login_required
+@require_POST
+@rate_limit('planner_scenarios_api')
+def planner_scenarios_api(request):
+    """
+    What-if planner results for a farm under many weather scenarios (JSON body):
+        {"scenarios": [{"name": "hot", "temp_delta": 3, "rain": "fail"}, ...]}
+        {"monte_carlo": {"samples": 500, "temp_sd": 2, "humidity_sd": 8, "rain_fail_probability": 0.2, "seed": 1}}
+    Staff (extension officers) may add "farmer": "<username>" to evaluate another farm
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON"}, status=400)
+    if not isinstance(body, dict):
+        return JsonResponse({"error": "Request body must be a JSON object"}, status=400)
+
+    farmer = request.user
+    city, _ = get_user_location(request)
+    if body.get('farmer') and body['farmer'] != request.user.username:
+        if not request.user.is_staff:
+            return JsonResponse({"error": "Only staff can evaluate another farmer's plan"}, status=403)
+        farmer = get_object_or_404(User, username=body['farmer'])
+        profile = UserProfile.objects.filter(user=farmer).first()
+        city = (profile.city if profile and profile.city else None) or "Delhi"
+
+    try:
+        if 'monte_carlo' in body:
+            options = body['monte_carlo'] if isinstance(body['monte_carlo'], dict) else {}
+            scenarios = sample_scenarios(**{key: options[key] for key in SAMPLING_OPTIONS if key in options})
+        else:
+            scenarios = parse_scenarios(body.get('scenarios'))
+    except (TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    weather_data, forecast_data = get_weather_and_forecast(city)
+    crops = list(Crop.objects.filter(user=farmer).order_by('id').values_list('name', 'area'))
+    result = evaluate_scenarios(crops, weather_data, forecast_data, scenarios,
+                                climate_zone=climate_zone_for_place(city, weather_data))
+    result.update({'farmer': farmer.username, 'city': city})
+    return JsonResponse(result)
+
+
+@staff_member_required
+def upstream_quota_api(request):
+    """Today's OpenWeather call consumption across all workers"""
+    return JsonResponse(quota_status())
+
+
+@staff_member_required
+def irrigation_report_api(request):
+    """Per-district planner totals from the latest (or requested) irrigation report"""
+    reports = IrrigationDemandReport.objects.all()
+    report_date = request.GET.get("date")
+    if report_date:
+        try:
+            report_date = date.fromisoformat(report_date)
+        except ValueError:
+            return JsonResponse({"error": "date must be YYYY-MM-DD"}, status=400)
+    else:
+        report_date = reports.order_by('-report_date').values_list('report_date', flat=True).first()
+    if request.GET.get("state"):
+        reports = reports.filter(state=request.GET["state"].strip().title())
+    rows = list(reports.filter(report_date=report_date).order_by('state', '-water_litres').values(
+        'state', 'district', 'farms', 'plots', 'total_area', 'water_litres', 'urea_kg', 'seeds_kg', 'generated_at'
+    ))
+    return JsonResponse({
+        'report_date': report_date,
+        'districts': rows,
+        'total_water_litres': sum(row['water_litres'] for row in rows),
+    })
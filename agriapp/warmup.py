@@ -0,0 +1,107 @@
+"""
+Worker Warm-up
+Does the lazy first-request work up front, once per worker process:
+URL resolver and view imports, template compilation, the lookup indexes
+(crop registry, advisory catalog and wire codes, bundled places, climate
+raster), database connections and (optionally) the weather cache for the
+most common farm cities. Called from gunicorn's post_worker_init hook
+(see gunicorn.conf.py).
+
+Connections opened here belong to the worker's main thread. Under
+UvicornWorker requests run on other threads and never reuse them, so the
+database stage is skipped there (databases=False).
+"""
+
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.template.loader import get_template
+from django.urls import reverse
+
+
+WARMUP_TEMPLATES = [
+    'base.html', 'home.html', 'login.html', 'register.html', 'dashboard.html',
+    'weather.html', 'mandi.html', 'farm_planner.html', 'edit_crop.html',
+]
+
+
+def warm_urls():
+    # The first reverse() imports every view module and builds the resolver
+    reverse('dashboard')
+
+
+def warm_templates():
+    for name in WARMUP_TEMPLATES:
+        get_template(name)
+
+
+def warm_lookups():
+    """Build the per-process lookup indexes every request path reads"""
+    from .advisory_catalog import LANGUAGES, compiled_catalog
+    from .climate_zones import climate_raster
+    from .crop_registry import get_registry
+    from .geocoding import bundled_places
+    from .wire_format import catalog_codes, catalog_payload
+
+    get_registry()
+    compiled_catalog()
+    catalog_codes()
+    for lang in LANGUAGES:
+        catalog_payload(lang)
+    bundled_places()
+    climate_raster()
+
+
+def warm_databases():
+    """Open each configured connection and touch the hot tables"""
+    from .models import Crop, MandiPrice, UserProfile
+
+    for alias in connections:
+        connections[alias].ensure_connection()
+    Crop.objects.only('id').first()
+    UserProfile.objects.only('id').first()
+    MandiPrice.objects.only('id').order_by('-updated_at').first()
+
+
+def warm_weather(top_n):
+    """Fetch current weather for the top_n cities with the most farmers"""
+    from .views import get_weather_data
+    from .upstream_quota import PREFETCH
+    from .models import UserProfile
+
+    cities = (UserProfile.objects.values('city')
+              .annotate(farmers=Count('id'))
+              .order_by('-farmers')
+              .values_list('city', flat=True)[:top_n])
+    for city in cities:
+        if city:
+            get_weather_data(city, PREFETCH)
+
+
+def warm_up(weather_cities=None, databases=True):
+    """Run every warm-up stage; returns {stage: milliseconds}"""
+    if weather_cities is None:
+        weather_cities = settings.WARMUP_WEATHER_CITIES
+
+    stages = [
+        ('urls', warm_urls),
+        ('templates', warm_templates),
+        ('lookups', warm_lookups),
+    ]
+    if databases:
+        stages.append(('databases', warm_databases))
+    if weather_cities:
+        stages.append(('weather', lambda: warm_weather(weather_cities)))
+
+    timings = {}
+    for name, stage in stages:
+        started = time.perf_counter()
+        try:
+            stage()
+        except Exception as e:
+            # A failed stage only means that work stays lazy
+            print(f"Warm-up stage {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
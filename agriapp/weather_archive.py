@@ -0,0 +1,273 @@
+"""
+Weather Archive
+Every upstream current-weather reading is kept in WeatherObservation and
+every forecast day in WeatherRollup (source 'forecast') until that day is
+observed. `manage.py rollup_weather` downsamples readings into daily and
+monthly rollups and prunes old raw rows. On top of the rollups:
+    climatology('Jaipur', day)      -> normal temp / humidity / rain for that week
+    weather_anomaly('Jaipur', weather_data)
+    fallback_weather('Jaipur')      -> estimate when the upstream fetch fails
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import WeatherObservation, WeatherRollup
+
+
+# A week needs this many observed days (across earlier years) to count as a normal
+MIN_CLIMATOLOGY_DAYS = 3
+
+# Advisories mention a reading this far (°C) from the week's normal
+ANOMALY_ALERT_DEGREES = 4
+CLIMATOLOGY_CACHE_SECONDS = 6 * 60 * 60
+CLIMATOLOGY_DESCRIPTION = 'seasonal normal'
+
+ROLLUP_UPDATE_FIELDS = ['source', 'temp_min', 'temp_max', 'temp_mean', 'humidity_mean', 'rain_fraction',
+                        'sample_count', 'updated_at']
+
+
+def archive_city(city):
+    return city.strip().title()
+
+
+def is_rain(description):
+    description = description.lower()
+    return 'rain' in description or 'drizzle' in description
+
+
+def record_observation(city, weather):
+    """Store one upstream reading; failures never break the request"""
+    try:
+        WeatherObservation.objects.create(
+            city=archive_city(city),
+            observed_at=timezone.now(),
+            temp=weather['temp'],
+            humidity=weather['humidity'],
+            description=weather['description'][:50],
+            rain=is_rain(weather['description']),
+        )
+    except Exception as e:
+        print(f"Weather archive error: {e}")
+
+
+def record_forecast(city, daily_forecasts):
+    """
+    Keep forecast days as provisional daily rollups
+    Days that already have an observed rollup are left alone
+    """
+    if not daily_forecasts:
+        return
+    city = archive_city(city)
+    # The same cached forecast is returned for a while; store each one once
+    if not cache.add(f"forecast-archived:{city.replace(' ', '_')}:{daily_forecasts[0]['date']}", True,
+                     settings.FORECAST_CACHE_SECONDS):
+        return
+    try:
+        observed = {day.isoformat() for day in WeatherRollup.objects.filter(
+            city=city, period='day', source='observed',
+            period_start__in=[day['date'] for day in daily_forecasts],
+        ).values_list('period_start', flat=True)}
+
+        rows = [
+            WeatherRollup(
+                city=city, period='day', period_start=day['date'], source='forecast',
+                temp_min=day['temp_min'], temp_max=day['temp_max'], temp_mean=day['temp_avg'],
+                humidity_mean=day['humidity_avg'], rain_fraction=1.0 if day.get('rain_probability') else 0.0,
+                sample_count=0,
+            )
+            for day in daily_forecasts
+            if day['date'] not in observed
+        ]
+        WeatherRollup.objects.bulk_create(
+            rows, update_conflicts=True,
+            unique_fields=['city', 'period', 'period_start'], update_fields=ROLLUP_UPDATE_FIELDS,
+        )
+    except Exception as e:
+        print(f"Weather archive error: {e}")
+
+
+# ========================================
+# DOWNSAMPLING
+# ========================================
+
+def rollup_days(since_date=None):
+    """
+    Daily rollups from raw readings on or after since_date (all when None)
+    Returns the set of (city, month start) touched
+    """
+    readings = WeatherObservation.objects.all()
+    if since_date is not None:
+        readings = readings.filter(observed_at__date__gte=since_date)
+
+    daily = readings.annotate(day=TruncDate('observed_at')).values('city', 'day').annotate(
+        temp_min=Min('temp'), temp_max=Max('temp'), temp_mean=Avg('temp'),
+        humidity_mean=Avg('humidity'), rain_count=Count('id', filter=Q(rain=True)), sample_count=Count('id'),
+    )
+
+    rows = []
+    months = set()
+    for row in daily.iterator():
+        rows.append(WeatherRollup(
+            city=row['city'], period='day', period_start=row['day'], source='observed',
+            temp_min=row['temp_min'], temp_max=row['temp_max'], temp_mean=round(row['temp_mean'], 2),
+            humidity_mean=round(row['humidity_mean'], 2),
+            rain_fraction=round(row['rain_count'] / row['sample_count'], 3), sample_count=row['sample_count'],
+        ))
+        months.add((row['city'], row['day'].replace(day=1)))
+
+    WeatherRollup.objects.bulk_create(
+        rows, batch_size=1000, update_conflicts=True,
+        unique_fields=['city', 'period', 'period_start'], update_fields=ROLLUP_UPDATE_FIELDS,
+    )
+    return months
+
+
+def rollup_months(months):
+    """Monthly rollups from the observed daily rollups of the given (city, month start) pairs"""
+    by_city = defaultdict(list)
+    for city, month in months:
+        by_city[city].append(month)
+
+    rows = []
+    for city, starts in by_city.items():
+        days = WeatherRollup.objects.filter(
+            city=city, period='day', source='observed',
+            period_start__gte=min(starts), period_start__lt=(max(starts) + timedelta(days=32)).replace(day=1),
+        ).values_list('period_start', 'temp_min', 'temp_max', 'temp_mean', 'humidity_mean', 'rain_fraction')
+
+        grouped = defaultdict(list)
+        for row in days:
+            grouped[row[0].replace(day=1)].append(row)
+
+        for month in starts:
+            values = grouped.get(month)
+            if not values:
+                continue
+            count = len(values)
+            rows.append(WeatherRollup(
+                city=city, period='month', period_start=month, source='observed',
+                temp_min=min(v[1] for v in values), temp_max=max(v[2] for v in values),
+                temp_mean=round(sum(v[3] for v in values) / count, 2),
+                humidity_mean=round(sum(v[4] for v in values) / count, 2),
+                rain_fraction=round(sum(1 for v in values if v[5] > 0) / count, 3),
+                sample_count=count,
+            ))
+
+    WeatherRollup.objects.bulk_create(
+        rows, batch_size=1000, update_conflicts=True,
+        unique_fields=['city', 'period', 'period_start'], update_fields=ROLLUP_UPDATE_FIELDS,
+    )
+    return len(rows)
+
+
+def prune_observations(retention_days=None):
+    """Delete raw readings older than the retention window (already rolled up)"""
+    retention_days = retention_days or settings.WEATHER_RAW_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = WeatherObservation.objects.filter(observed_at__lt=cutoff).delete()
+    return deleted
+
+
+# ========================================
+# CLIMATOLOGY & ANOMALY
+# ========================================
+
+def climatology(city, day=None):
+    """
+    Normal weather for a city around a date: mean of observed daily rollups in
+    the same ISO week of every earlier year, else the same calendar month
+    Only years before `day`'s are used, so the normal is never today compared
+    with the last few days. Returns None until earlier years cover the week or month
+    """
+    city = archive_city(city)
+    day = day or timezone.localdate()
+    week = day.isocalendar()[1]
+    cache_key = f"climatology:{city.replace(' ', '_')}:{day.year}:{week}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached or None
+
+    # Before this year and before this ISO week (which may start in late December)
+    cutoff = min(day.replace(month=1, day=1), day - timedelta(days=day.weekday()))
+    days = WeatherRollup.objects.filter(city=city, period='day', source='observed', period_start__lt=cutoff)
+    normal = days.filter(period_start__week=week).aggregate(
+        temp_mean=Avg('temp_mean'), temp_max=Avg('temp_max'), temp_min=Avg('temp_min'),
+        humidity_mean=Avg('humidity_mean'), rain_fraction=Avg('rain_fraction'), days=Count('id'),
+    )
+    normal['basis'] = 'week'
+    if not normal['days'] or normal['days'] < MIN_CLIMATOLOGY_DAYS:
+        normal = WeatherRollup.objects.filter(
+            city=city, period='month', source='observed', period_start__month=day.month,
+            period_start__lt=cutoff,
+        ).aggregate(
+            temp_mean=Avg('temp_mean'), temp_max=Avg('temp_max'), temp_min=Avg('temp_min'),
+            humidity_mean=Avg('humidity_mean'), rain_fraction=Avg('rain_fraction'), days=Sum('sample_count'),
+        )
+        normal['basis'] = 'month'
+        if not normal['days'] or normal['days'] < MIN_CLIMATOLOGY_DAYS:
+            normal = {}
+
+    for field in ('temp_mean', 'temp_max', 'temp_min', 'humidity_mean', 'rain_fraction'):
+        if field in normal:
+            normal[field] = round(normal[field], 1 if field != 'rain_fraction' else 2)
+
+    cache.set(cache_key, normal, CLIMATOLOGY_CACHE_SECONDS)
+    return normal or None
+
+
+def weather_anomaly(city, weather_data, day=None):
+    """How far a reading is from the city's normal for the week (None without history)"""
+    normal = climatology(city, day)
+    if not normal or weather_data.get('estimated'):
+        return None
+    return {
+        'temp': round(weather_data['temp'] - normal['temp_mean'], 1),
+        'humidity': round(weather_data['humidity'] - normal['humidity_mean'], 1),
+        'normal': normal,
+    }
+
+
+def anomaly_level(anomaly):
+    """'above' / 'below' when the reading is unusual enough to advise on, else None"""
+    if not anomaly:
+        return None
+    if anomaly['temp'] >= ANOMALY_ALERT_DEGREES:
+        return 'above'
+    if anomaly['temp'] <= -ANOMALY_ALERT_DEGREES:
+        return 'below'
+    return None
+
+
+def fallback_weather(city, day=None):
+    """
+    Best local estimate when the upstream fetch fails: the forecast made
+    earlier for this day, else climatology for the week. None if neither exists
+    A weekly average says nothing about rain today, so climatology estimates
+    get a neutral description that no rain rule reacts to
+    """
+    day = day or timezone.localdate()
+    forecast = WeatherRollup.objects.filter(
+        city=archive_city(city), period='day', period_start=day, source='forecast',
+    ).values('temp_mean', 'humidity_mean', 'rain_fraction').first()
+    if forecast:
+        estimate, source = forecast, 'forecast'
+    else:
+        estimate, source = climatology(city, day), 'climatology'
+        if not estimate:
+            return None
+    temp, humidity, rain_fraction = estimate['temp_mean'], estimate['humidity_mean'], estimate['rain_fraction']
+
+    return {
+        'temp': round(temp),
+        'humidity': round(humidity),
+        'description': CLIMATOLOGY_DESCRIPTION if source == 'climatology'
+                       else 'light rain' if rain_fraction >= 0.5 else 'clear sky',
+        'estimated': source,
+    }
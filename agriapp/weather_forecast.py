@@ -6,13 +6,59 @@ Uses OpenWeather One Call API 3.0 (free tier)
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 
+from .upstream_quota import USER, acquire
 
-def get_7day_forecast(lat, lon):
+
+# A forecast day at or above this maximum counts towards a heat streak
+HOT_DAY_TEMP = 38
+
+
+def forecast_cache_key(lat, lon):
+    return f"forecast:{float(lat):.2f}:{float(lon):.2f}"
+
+
+def get_7day_forecast(lat, lon, priority=USER):
     """
     Fetch 7-day forecast from OpenWeather One Call API
-    Free tier allows 1000 calls/day
+    Free tier allows 1000 calls/day; calls are budgeted by upstream_quota
+    Cached per coordinate (~1 km grid) for settings.FORECAST_CACHE_SECONDS
     """
+    cached = cache.get(forecast_cache_key(lat, lon))
+    if cached is not None:
+        return cached
+
+    daily_forecasts = fetch_forecast(lat, lon) if acquire(priority) else None
+    return remember_forecast(lat, lon, daily_forecasts)
+
+
+def start_forecast(lat, lon, pool, priority=USER):
+    """
+    get_7day_forecast with the upstream call running in `pool` while the
+    caller does other work; call the returned function for the result.
+    Quota and cache access stay on the calling thread
+    """
+    cached = cache.get(forecast_cache_key(lat, lon))
+    if cached is not None:
+        return lambda: cached
+
+    future = pool.submit(fetch_forecast, lat, lon) if acquire(priority) else None
+    return lambda: remember_forecast(lat, lon, future.result() if future else None)
+
+
+def remember_forecast(lat, lon, daily_forecasts):
+    """Cache a fresh forecast; without one (quota refused, upstream failed) the last good one, if any"""
+    cache_key = forecast_cache_key(lat, lon)
+    if daily_forecasts:
+        cache.set(cache_key, daily_forecasts, settings.FORECAST_CACHE_SECONDS)
+        cache.set(f"stale-{cache_key}", daily_forecasts, settings.WEATHER_STALE_SECONDS)
+        return daily_forecasts
+    return cache.get(f"stale-{cache_key}")
+
+
+def fetch_forecast(lat, lon):
+    """Upstream 5-day / 3-hour forecast aggregated to daily rows"""
     api_key = settings.OPENWEATHER_API_KEY
     url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={api_key}&units=metric"
     
@@ -29,6 +75,7 @@ def get_7day_forecast(lat, lon):
         day_temps = []
         day_humidity = []
         day_rain = 0
+        day_rain_mm = 0.0
         
         for item in data['list'][:40]:  # Next 5 days (8 readings per day)
             date = item['dt_txt'].split(' ')[0]
@@ -46,6 +93,7 @@ def get_7day_forecast(lat, lon):
                         'temp_avg': round(sum(day_temps) / len(day_temps)),
                         'humidity_avg': round(sum(day_humidity) / len(day_humidity)),
                         'rain_probability': day_rain > 0,
+                        'rain_mm': round(day_rain_mm, 1),
                         'description': item['weather'][0]['description']
                     })
                 
@@ -54,12 +102,14 @@ def get_7day_forecast(lat, lon):
                 day_temps = []
                 day_humidity = []
                 day_rain = 0
+                day_rain_mm = 0.0
             
             # Collect data for current day
             day_temps.append(item['main']['temp'])
             day_humidity.append(item['main']['humidity'])
             if 'rain' in item:
                 day_rain = 1
+                day_rain_mm += item['rain'].get('3h', 0)
         
         return daily_forecasts[:7]  # Return max 7 days
     
@@ -108,7 +158,7 @@ def analyze_forecast_unpredictability(daily_forecasts):
     # 2. Consecutive Hot Days (≥ 38°C)
     current_streak = 0
     for day in daily_forecasts:
-        if day['temp_max'] >= 38:
+        if day['temp_max'] >= HOT_DAY_TEMP:
             current_streak += 1
             analysis['consecutive_hot_days'] = current_streak
             analysis['max_consecutive_hot'] = max(analysis['max_consecutive_hot'], current_streak)
@@ -0,0 +1,107 @@
+"""
+Compact Wire Format
+Low-bandwidth clients ask for ?format=compact (JSON) or ?format=msgpack and
+get advisory codes plus numeric parameters instead of formatted bilingual
+text. Texts come from /api/advisory-catalog/?lang=hi, fetched once and
+cached by the client until the catalog version "v" changes:
+    {"v": "3f9a1c2e07", "p": {"crop": "Rice", "crop_hi": "धान"}, "i": [[0, 4], [7]]}
+Each item is [code, *values of that code's catalog params not found in "p"].
+"""
+
+import hashlib
+import json
+import string
+from functools import lru_cache
+
+from django.http import HttpResponse, JsonResponse
+
+from .advisory_catalog import LANGUAGES, catalog_source
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+FORMATS = ('json', 'compact', 'msgpack')
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
+# Clients revalidate with If-None-Match after this; "v" mismatches refetch sooner
+CATALOG_MAX_AGE = 24 * 60 * 60
+
+
+def template_params(entry):
+    """Sorted placeholder names used by any text of a catalog entry"""
+    names = set()
+    for lang in LANGUAGES:
+        for text in entry[lang].values():
+            names.update(name for _, name, _, _ in string.Formatter().parse(text) if name)
+    return sorted(names)
+
+
+@lru_cache(maxsize=None)
+def catalog_codes():
+    """advisory_key -> (code, params); codes are positions in the catalog"""
+    return {key: (code, template_params(entry)) for code, (key, entry) in enumerate(catalog_source().items())}
+
+
+@lru_cache(maxsize=None)
+def catalog_payload(lang):
+    """Everything needed to render codes in one language, indexed by code"""
+    advisories = []
+    for key, entry in catalog_source().items():
+        advisories.append([key, entry.get('alert_type'), entry.get('icon'), catalog_codes()[key][1], entry[lang]])
+    return {'v': catalog_version(), 'lang': lang, 'advisories': advisories}
+
+
+@lru_cache(maxsize=None)
+def catalog_version():
+    """Short content hash over every language, so codes and texts change together"""
+    content = [
+        [key, entry.get('alert_type'), entry.get('icon'), {lang: entry[lang] for lang in LANGUAGES}]
+        for key, entry in catalog_source().items()
+    ]
+    encoded = json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:10]
+
+
+def compact_advisories(advisories):
+    """
+    {'v', 'p', 'i'} for a list of advisories
+    Text params shared by every advisory (crop names) are sent once in 'p'
+    """
+    shared = None
+    for advisory in advisories:
+        params = advisory['params']
+        if shared is None:
+            shared = {name: value for name, value in params.items() if isinstance(value, str)}
+        else:
+            shared = {name: value for name, value in shared.items() if params.get(name) == value}
+
+    codes = catalog_codes()
+    items = []
+    for advisory in advisories:
+        if advisory['advisory_key'] not in codes:
+            # Stored under a key the catalog no longer has
+            continue
+        code, names = codes[advisory['advisory_key']]
+        items.append([code] + [advisory['params'].get(name) for name in names if name not in (shared or {})])
+
+    return {'v': catalog_version(), 'p': shared or {}, 'i': items}
+
+
+def get_format(request):
+    """?format=json|compact|msgpack, defaulting to the verbose JSON"""
+    fmt = (request.GET.get('format') or '').lower()
+    return fmt if fmt in FORMATS else 'json'
+
+
+def compact_response(data, fmt):
+    """Minified UTF-8 JSON, or MessagePack when asked for and installed"""
+    if fmt == 'msgpack':
+        if msgpack is None:
+            print("msgpack is not installed; cannot send format=msgpack")
+            return JsonResponse({'error': 'MessagePack format is not available'}, status=406)
+        return HttpResponse(msgpack.packb(data, use_bin_type=True), content_type=MSGPACK_CONTENT_TYPE)
+
+    return JsonResponse(data, safe=False, json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')})
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for agri
+Usage: gunicorn -c gunicorn.conf.py agri.wsgi
+       gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker agri.asgi:application
+       (ASGI keeps live dashboard alerts as cheap long-lived streams)
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "3"))
+
+
+def post_worker_init(worker):
+    # Runs in each worker after agri.wsgi is loaded, before it accepts requests
+    from agriapp.warmup import warm_up
+
+    # UvicornWorker serves requests from other threads, which never reuse
+    # connections opened here
+    asgi = worker.__class__.__module__.startswith('uvicorn')
+    timings = warm_up(databases=not asgi)
+    worker.log.info("Warm-up finished: %s", ", ".join(f"{name} {ms}ms" for name, ms in timings.items()))
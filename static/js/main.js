@@ -64,6 +64,14 @@ document.addEventListener('DOMContentLoaded', function() {
             }, 50);
         }, index * 100);
     });
+
+    // ========================================
+    // LIVE ALERTS (SERVER-SENT EVENTS)
+    // ========================================
+    const liveAlerts = document.getElementById('live-alerts');
+    if (liveAlerts && window.EventSource) {
+        startLiveAlerts(liveAlerts.dataset.url + '?lang=' + (liveAlerts.dataset.lang || 'en'));
+    }
 });
 
 
@@ -75,12 +83,12 @@ function updateCropInsightCard(insightBody, insights) {
     
     insights.slice(0, 2).forEach(insight => {
         const insightHTML = `
-            <div class="insight-item mb-3 alert alert-${insight.type}" role="alert">
+            <div class="insight-item mb-3 alert alert-${insight.alert_type}" role="alert">
                 <div class="d-flex align-items-start">
                     <span class="insight-icon me-2">${insight.icon}</span>
                     <div class="flex-grow-1">
                         <strong class="d-block">${insight.message}</strong>
-                        <small class="text-muted mt-1 d-block">💡 ${insight.action}</small>
+                        <small class="text-muted mt-1 d-block">💡 ${insight.suggested_action}</small>
                     </div>
                 </div>
             </div>
@@ -90,6 +98,54 @@ function updateCropInsightCard(insightBody, insights) {
 }
 
 
+// ========================================
+// LIVE ALERTS: weather, crop insights, forecast & state risks
+// ========================================
+function startLiveAlerts(url) {
+    const source = new EventSource(url);
+    let firstUpdate = true;
+
+    source.addEventListener('alerts', event => {
+        const data = JSON.parse(event.data);
+
+        const readings = {
+            temp: `${data.weather.temp}°C`,
+            humidity: `${data.weather.humidity}%`,
+            description: data.weather.description,
+        };
+        Object.entries(readings).forEach(([key, value]) => {
+            const element = document.querySelector(`[data-live="${key}"]`);
+            if (element) element.textContent = value;
+        });
+
+        data.crop_insights.forEach(item => {
+            const list = document.querySelector(`.insight-list[data-crop="${CSS.escape(item.crop)}"]`);
+            if (!list) return;
+            list.innerHTML = item.insights.map(insight => `
+                <div class="insight-compact ${insight.alert_type}">
+                    <strong>${insight.icon} ${insight.message}</strong><br>
+                    <small style="color: var(--text-muted);">💡 ${insight.suggested_action}</small>
+                </div>
+            `).join('');
+        });
+
+        const banner = document.getElementById('live-alert-banner');
+        const alerts = data.forecast_warnings.map(warning => `⚠️ ${warning}`)
+            .concat(data.state_alerts.map(alert => `${alert.icon} ${alert.name}`));
+        if (banner) {
+            banner.innerHTML = alerts.join('<br>');
+            banner.hidden = alerts.length === 0;
+        }
+
+        // The first message only confirms what the page already shows
+        if (!firstUpdate) {
+            showToast('Weather update received / मौसम अपडेट', 'success');
+        }
+        firstUpdate = false;
+    });
+}
+
+
 // ========================================
 // TOAST NOTIFICATION
 // ========================================